@@ -0,0 +1,215 @@
+"""
+Throughput and latency benchmarks for `rake.Rake` and `rake.rake_old.Rake`.
+
+Synthetic corpora are generated deterministically from a seed, so results
+are comparable across commits. Run from the repository root:
+
+    python benchmarks/bench_rake.py --output bench.json
+    python benchmarks/bench_rake.py --compare bench.json
+
+and the JSON report (docs/sec, tokens/sec, per-stage latency percentiles and
+peak traced memory per engine and corpus) is written to `--output`.
+"""
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from rake import rake_old  # noqa: E402
+from rake.rake import Rake  # noqa: E402
+from rake.FoxStoplist import stopwords  # noqa: E402
+
+# name: (number of documents, words per document)
+CORPORA = {
+    'tweets': (2000, 20),
+    'abstracts': (300, 200),
+    'reports': (5, 20000),
+}
+
+_SYLLABLES = ['ka', 'lo', 'mi', 'ne', 'ru', 'sa', 'ti', 'vo', 'xe', 'zu', 'tra', 'pel', 'dor', 'quin']
+
+
+def generate_corpus(n_documents, n_words, seed=0):
+    """Deterministic synthetic documents with a Zipf-like vocabulary and stopwords."""
+    rng = random.Random(seed)
+    vocabulary = [''.join(rng.choice(_SYLLABLES) for _ in range(rng.randint(1, 4)))
+                  for _ in range(5000)]
+    # cumulative once per corpus; `choices` would otherwise re-accumulate
+    # the weights for every word, with the same draws
+    cum_weights = list(itertools.accumulate(1.0 / (rank + 1) for rank in range(len(vocabulary))))
+    docs = []
+    for _ in range(n_documents):
+        words = []
+        for _ in range(n_words):
+            r = rng.random()
+            if r < 0.35:
+                words.append(rng.choice(stopwords))
+            elif r < 0.40:
+                words.append(str(rng.randint(0, 2020)))
+            else:
+                words.append(rng.choices(vocabulary, cum_weights=cum_weights)[0])
+            if rng.random() < 0.08:
+                words[-1] += rng.choice('.,;:!?')
+        docs.append(' '.join(words))
+    return docs
+
+
+class _StageTimes(dict):
+    # `Rake(stats=...)` recorder keeping the times of the last run only
+    def record(self, stage, seconds, count):
+        self[stage] = seconds
+
+
+def _rake_stages(rake):
+    stats = _StageTimes()
+    timed = Rake(rake.stop_words_source, rake.backend, stats=stats)
+
+    def run(text):
+        timed.run(text)
+        return dict(stats)
+    return run
+
+
+def _rake_old_stages(rake):
+    # `rake_old.Rake.run`, step by step, under the stage names of `RakeStats`:
+    # rake_old has no tokens, so its tokenize stage is the sentence split and
+    # its candidates stage is the stopword matching within sentences
+    matcher = rake_old.build_stop_word_matcher(rake_old.load_stopword_list(rake.stop_words_source))
+
+    def run(text):
+        t0 = time.perf_counter()
+        sentences = rake_old.split_sentences(text)
+        t1 = time.perf_counter()
+        phrases = rake_old.generate_candidate_keywords(sentences, matcher)
+        t2 = time.perf_counter()
+        phrase_words = rake_old._split_phrases(phrases)
+        word_scores = rake_old.calculate_word_scores(phrases, phrase_words)
+        t3 = time.perf_counter()
+        candidates = rake_old.generate_candidate_keyword_scores(phrases, word_scores, phrase_words)
+        sorted(candidates.items(), key=lambda x: x[1], reverse=True)
+        t4 = time.perf_counter()
+        return {'tokenize': t1 - t0, 'candidates': t2 - t1,
+                'word_scores': t3 - t2, 'phrase_scores': t4 - t3}
+    return run
+
+
+ENGINES = {
+    'rake': (lambda: Rake('fox'), _rake_stages),
+    'rake_old': (lambda: rake_old.Rake('fox'), _rake_old_stages),
+}
+
+
+def _percentiles(samples):
+    samples = sorted(samples)
+    return {'p{}'.format(p): samples[min(len(samples) - 1, int(len(samples) * p / 100))]
+            for p in (50, 90, 99)}
+
+
+def bench(engine, docs, repeat=3):
+    """Benchmark one engine on one corpus; returns a JSON-serialisable dict."""
+    make, stages = ENGINES[engine]
+    rake = make()
+    n_tokens = sum(len(doc.split()) for doc in docs)
+
+    # throughput: best of `repeat` passes over the corpus with `run`
+    elapsed = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for doc in docs:
+            rake.run(doc)
+        elapsed = min(elapsed, time.perf_counter() - start)
+
+    # latency of each stage for each document
+    run_stages = stages(rake)
+    latencies = {}
+    for doc in docs:
+        for stage, seconds in run_stages(doc).items():
+            latencies.setdefault(stage, []).append(seconds)
+
+    tracemalloc.start()
+    for doc in docs:
+        rake.run(doc)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        'documents': len(docs),
+        'tokens': n_tokens,
+        'seconds': elapsed,
+        'docs_per_sec': len(docs) / elapsed,
+        'tokens_per_sec': n_tokens / elapsed,
+        'stage_latency': {stage: _percentiles(samples) for stage, samples in latencies.items()},
+        'peak_memory_bytes': peak,
+    }
+
+
+def _commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], stderr=subprocess.DEVNULL,
+                                       cwd=os.path.dirname(os.path.abspath(__file__))).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--output', '-o', help='write the JSON report to this file instead of stdout')
+    parser.add_argument('--compare', help='JSON report of a previous run to compare throughput with')
+    parser.add_argument('--corpus', action='append', choices=sorted(CORPORA),
+                        help='corpus to run (default: all); can be repeated')
+    parser.add_argument('--engine', action='append', choices=sorted(ENGINES),
+                        help='engine to run (default: all); can be repeated')
+    parser.add_argument('--scale', type=float, default=1.0,
+                        help='multiply the number of documents of every corpus')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    report = {
+        'commit': _commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'seed': args.seed,
+        'scale': args.scale,
+        'results': {},
+    }
+    for corpus in args.corpus or sorted(CORPORA):
+        n_documents, n_words = CORPORA[corpus]
+        docs = generate_corpus(max(1, int(n_documents * args.scale)), n_words, seed=args.seed)
+        for engine in args.engine or sorted(ENGINES):
+            result = bench(engine, docs, repeat=args.repeat)
+            report['results'].setdefault(corpus, {})[engine] = result
+            print('{:<10} {:<9} {:>12.1f} docs/s {:>12.0f} tokens/s {:>10.1f} MiB peak'.format(
+                corpus, engine, result['docs_per_sec'], result['tokens_per_sec'],
+                result['peak_memory_bytes'] / 2 ** 20), file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare) as f:
+            previous = json.load(f)['results']
+        for corpus, engines in report['results'].items():
+            for engine, result in engines.items():
+                before = previous.get(corpus, {}).get(engine)
+                if before:
+                    print('{:<10} {:<9} {:>6.2f}x docs/s vs {}'.format(
+                        corpus, engine, result['docs_per_sec'] / before['docs_per_sec'],
+                        args.compare), file=sys.stderr)
+
+    output = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -1 +1,36 @@
-from .rake import *  # noqa
+from .rake import KeywordScore, Rake, RakeStats, WordScore
+from .stoplists import get_stopwords, register_stopwords, stopword_sources
+
+# name: submodule defining it; imported on first access so that `import rake`
+# does not pay for multiprocessing, sqlite3 or asyncio
+_lazy = {
+    'AsyncRake': 'aio',
+    'CachedRake': 'cache',
+    'CorpusRake': 'corpus',
+    'IdfIndex': 'idf',
+    'IdfIndexBuilder': 'idf',
+    'IncrementalRake': 'incremental',
+    'KeywordIndex': 'index',
+    'KeywordBatch': 'columnar',
+    'KeywordIndexBuilder': 'index',
+    'ParallelRake': 'parallel',
+    'WindowedRake': 'window',
+}
+
+__all__ = ['AsyncRake', 'CachedRake', 'CorpusRake', 'IdfIndex', 'IdfIndexBuilder',
+           'IncrementalRake', 'KeywordBatch', 'KeywordIndex', 'KeywordIndexBuilder', 'KeywordScore',
+           'ParallelRake', 'Rake', 'RakeStats', 'WindowedRake', 'WordScore',
+           'get_stopwords', 'register_stopwords', 'stopword_sources']
+
+
+def __getattr__(name):
+    if name in _lazy:
+        from importlib import import_module
+        value = getattr(import_module('.' + _lazy[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy))
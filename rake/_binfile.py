@@ -0,0 +1,56 @@
+"""
+Helpers shared by the binary files of `rake.idf`, `rake.index` and
+`rake.columnar`: little-endian typed arrays, sections aligned to 8 bytes and
+atomic replacement of the file being written.
+"""
+
+import os
+import sys
+from array import array
+from contextlib import contextmanager
+
+
+def aligned(n):
+    """`n` rounded up to a multiple of 8."""
+    return (n + 7) & ~7
+
+
+def to_bytes(values, typecode=None):
+    """Little-endian bytes of an array, or of a buffer of `typecode` items, eg. a memoryview."""
+    if sys.byteorder == 'big':
+        values = array(typecode or values.typecode, values)
+        values.byteswap()
+    return bytes(values)
+
+
+def from_bytes(typecode, data):
+    """Array of `typecode` items from little-endian bytes."""
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values
+
+
+def write_aligned(f, data):
+    """Write `data` and zeros up to the next multiple of 8 bytes; returns the size written."""
+    f.write(data)
+    f.write(b'\0' * (-len(data) % 8))
+    return aligned(len(data))
+
+
+@contextmanager
+def atomic_write(path):
+    """Binary file object that replaces `path` once the block completes.
+
+    Data goes to a temporary file next to `path`, which is removed if the
+    block or the replacement fails, so `path` is never left half written.
+    """
+    tmp = '{}.tmp{}'.format(path, os.getpid())
+    try:
+        with open(tmp, 'wb') as f:
+            yield f
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
@@ -0,0 +1,76 @@
+"""
+NumPy scoring backend for `Rake(backend='numpy')`.
+
+Computes the same tables as `_ScoreTable.word_tables` and
+`_ScoreTable.phrase_tables` with scatter-adds and segment sums over the
+phrase/word id arrays instead of per-word Python loops. Importing this module
+raises ImportError when NumPy is not installed.
+"""
+
+import numpy as np
+
+
+def _ids(buffer):
+    # zero-copy view of an array('l')
+    return np.frombuffer(buffer, dtype='l') if len(buffer) else np.zeros(0, dtype='l')
+
+
+class NumpyBackend(object):
+
+    def _pairs(self, table):
+        # phrase id and word id of every word of every counted phrase
+        ends = _ids(table.phrase_ends)
+        counts = _ids(table.phrase_counts)
+        lengths = np.diff(ends, prepend=0)
+        phrase_ids = np.repeat(np.arange(len(ends)), lengths)
+        keep = counts[phrase_ids] > 0
+        return phrase_ids[keep], _ids(table.phrase_words)[keep], lengths, counts
+
+    def word_tables(self, table):
+        n_words = len(table.words)
+        phrase_ids, word_ids, lengths, counts = self._pairs(table)
+        degree = np.bincount(word_ids, weights=(lengths * counts)[phrase_ids],
+                             minlength=n_words).astype(np.int64)
+        freq = np.bincount(word_ids, weights=counts[phrase_ids],
+                           minlength=n_words).astype(np.int64)
+
+        ratio = np.divide(degree, freq, out=np.zeros(n_words), where=freq > 0)
+        # np.round is not correctly rounded, so round each distinct ratio the
+        # way the Python backend does
+        distinct, inverse = np.unique(ratio, return_inverse=True)
+        score = np.array([round(x, 2) for x in distinct.tolist()])[inverse.reshape(-1)]
+        return degree.tolist(), freq.tolist(), score.tolist()
+
+    def phrase_tables(self, table, degree, freq, score):
+        n_phrases = len(table.keywords)
+        sum_deg = np.zeros(n_phrases, dtype=np.int64)
+        sum_freq = np.zeros(n_phrases, dtype=np.int64)
+        sum_score = np.zeros(n_phrases)
+
+        phrase_ids, word_ids = self._pairs(table)[:2]
+        if len(phrase_ids):
+            # each word counts once per phrase, in id order
+            order = np.lexsort((word_ids, phrase_ids))
+            phrase_ids, word_ids = phrase_ids[order], word_ids[order]
+            first = np.ones(len(phrase_ids), dtype=bool)
+            first[1:] = (phrase_ids[1:] != phrase_ids[:-1]) | (word_ids[1:] != word_ids[:-1])
+            phrase_ids, word_ids = phrase_ids[first], word_ids[first]
+
+            starts = np.flatnonzero(np.r_[True, phrase_ids[1:] != phrase_ids[:-1]])
+            segments = phrase_ids[starts]
+            sum_deg[segments] = np.add.reduceat(np.asarray(degree)[word_ids], starts)
+            sum_freq[segments] = np.add.reduceat(np.asarray(freq)[word_ids], starts)
+
+            # add scores one position at a time so every phrase is summed left
+            # to right, giving the same floats as the Python backend
+            word_scores = np.asarray(score)[word_ids]
+            position = np.arange(len(phrase_ids)) - np.repeat(starts, np.diff(np.r_[starts, len(phrase_ids)]))
+            by_position = np.argsort(position, kind='stable')
+            bounds = np.cumsum(np.bincount(position))
+            start = 0
+            for end in bounds.tolist():
+                rows = by_position[start:end]
+                sum_score[phrase_ids[rows]] += word_scores[rows]
+                start = end
+
+        return sum_deg.tolist(), sum_freq.tolist(), sum_score.tolist()
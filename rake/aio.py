@@ -0,0 +1,109 @@
+"""
+asyncio facade for `Rake`, for services that must not block their event loop.
+
+Extraction runs in an executor (threads by default, or any
+`concurrent.futures` executor such as a process pool). Requests arriving
+close together are sent to the executor as one batch to amortise dispatch,
+and the number of requests in flight is bounded.
+"""
+
+import asyncio
+
+from .rake import Rake
+
+
+def _run_batch(rake, requests):
+    results = []
+    for text, top_k, top_fraction in requests:
+        try:
+            results.append(next(rake.run_many([text], top_k=top_k, top_fraction=top_fraction)))
+        except Exception as e:
+            # only fail the request that caused it
+            results.append(e)
+    return results
+
+
+class AsyncRake(object):
+    """Run a `Rake` extractor from asyncio code without blocking the event loop.
+
+    Parameters
+    ----------
+    rake : Rake or None, default=None
+            Extractor to run. If None, uses `Rake()`
+    executor : concurrent.futures.Executor or None, default=None
+            Executor the batches run in. If None, uses the event loop's
+            default thread pool executor
+    max_in_flight : int, default=64
+            Maximum number of requests queued or running at once; further
+            calls to `run` wait for a slot
+    batch_size : int, default=16
+            Maximum number of requests sent to the executor together
+    batch_delay : float, default=0.001
+            Seconds to wait for more requests before sending a batch that is
+            not full
+    """
+
+    def __init__(self, rake=None, executor=None, max_in_flight=64, batch_size=16,
+                 batch_delay=0.001):
+        if max_in_flight < 1 or batch_size < 1:
+            raise ValueError('max_in_flight and batch_size must be at least 1')
+        self.rake = rake if rake is not None else Rake()
+        self.executor = executor
+        self.max_in_flight = max_in_flight
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self._slots = None
+        self._batch = []
+        self._timer = None
+
+    async def run(self, text, top_k=None, top_fraction=None):
+        """Runs the RAKE algorithm on `text` in the executor
+
+        Parameters
+        ----------
+        text, top_k, top_fraction : see `Rake.run`
+
+        Returns
+        -------
+        sorted_keywords : list of namedtuples, len=n_keywords
+        """
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_in_flight)
+        async with self._slots:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._batch.append(((text, top_k, top_fraction), future))
+            if len(self._batch) >= self.batch_size:
+                self.flush()
+            elif self._timer is None:
+                self._timer = loop.call_later(self.batch_delay, self.flush)
+            return await future
+
+    def flush(self):
+        """Send the requests waiting for a batch to the executor now."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._batch = self._batch, []
+        if not batch:
+            return
+        requests = [request for request, _ in batch]
+        futures = [future for _, future in batch]
+        task = asyncio.get_running_loop().run_in_executor(
+            self.executor, _run_batch, self.rake, requests)
+        task.add_done_callback(lambda task: self._resolve(task, futures))
+
+    def _resolve(self, task, futures):
+        if task.cancelled():
+            results = [asyncio.CancelledError()] * len(futures)
+        elif task.exception() is not None:
+            results = [task.exception()] * len(futures)
+        else:
+            results = task.result()
+        for future, result in zip(futures, results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
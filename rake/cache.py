@@ -0,0 +1,161 @@
+"""
+Keyword-result cache around `Rake`, for pipelines that see the same documents
+again (re-crawls, retries).
+
+Results are keyed by a hash of the document and of the extractor's
+configuration, kept in an in-memory LRU tier and, optionally, in an sqlite
+file that survives restarts.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+from collections import OrderedDict, namedtuple
+
+from .rake import KeywordScore, Rake, _limit
+
+CacheInfo = namedtuple(
+    'CacheInfo', ['hits', 'disk_hits', 'misses', 'maxsize', 'currsize'])
+
+
+def _fingerprint(rake):
+    pipeline = rake._pipeline
+    config = [sorted(pipeline.stopwords),
+              sorted(pipeline.phrase_delimiters),
+              list(pipeline.word_delimiters)]
+    # options are only appended when set, so existing caches keep their keys
+    if rake.adjoining:
+        config.append('adjoining')
+    if rake.idf is not None:
+        config.append(['idf', rake.idf.digest.hex()])
+    return hashlib.sha256(json.dumps(config).encode('utf-8')).digest()
+
+
+class CachedRake(object):
+    """Cache the keywords `Rake` extracts from each document.
+
+    Parameters
+    ----------
+    rake : Rake or None, default=None
+            Extractor whose results are cached. If None, uses `Rake()`
+    maxsize : int, default=1024
+            Maximum number of documents whose results are kept in memory; the
+            least recently used result is evicted first. This counts entries,
+            not bytes: an entry holds every keyword of its document, so size
+            it for the keyword count of the documents being cached
+    path : string or None, default=None
+            If given, results are also stored in an sqlite database at `path`,
+            which is shared by every `CachedRake` with the same configuration
+    """
+
+    def __init__(self, rake=None, maxsize=1024, path=None):
+        if maxsize < 0:
+            raise ValueError('maxsize must be non-negative, got {}'.format(maxsize))
+        self.rake = rake if rake is not None else Rake()
+        self.maxsize = maxsize
+        self.path = path
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._fingerprint = _fingerprint(self.rake)
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if path is not None:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            with self._db:
+                self._db.execute('CREATE TABLE IF NOT EXISTS keywords '
+                                 '(key BLOB PRIMARY KEY, value TEXT NOT NULL)')
+
+    def _key(self, text):
+        digest = hashlib.sha256(self._fingerprint)
+        if isinstance(text, list):
+            # tokenized lists must not collide with the same text as a string,
+            # nor with another list whose tokens join to the same characters
+            digest.update(b'\x01')
+            digest.update(json.dumps(text).encode('utf-8', 'surrogatepass'))
+        else:
+            digest.update(b'\x00')
+            digest.update(text.encode('utf-8', 'surrogatepass'))
+        return digest.digest()
+
+    def _remember(self, key, keywords):
+        if not self.maxsize:
+            return
+        self._memory[key] = keywords
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
+    def _lookup(self, key):
+        keywords = self._memory.get(key)
+        if keywords is not None:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return keywords
+        if self._db is not None:
+            row = self._db.execute('SELECT value FROM keywords WHERE key = ?', (key,)).fetchone()
+            if row is not None:
+                keywords = [KeywordScore(*i) for i in json.loads(row[0])]
+                self._remember(key, keywords)
+                self.disk_hits += 1
+                return keywords
+        self.misses += 1
+        return None
+
+    def _store(self, key, keywords):
+        self._remember(key, keywords)
+        if self._db is not None:
+            with self._db:
+                self._db.execute('INSERT OR REPLACE INTO keywords VALUES (?, ?)',
+                                 (key, json.dumps(keywords)))
+
+    def run(self, text, top_k=None, top_fraction=None):
+        """Runs the RAKE algorithm on `text`, or returns the cached result
+
+        Parameters
+        ----------
+        text, top_k, top_fraction : see `Rake.run`
+
+        Returns
+        -------
+        sorted_keywords : list of namedtuples, len=n_keywords
+        """
+        key = self._key(text)
+        with self._lock:
+            keywords = self._lookup(key)
+        if keywords is None:
+            # cache every keyword so any top_k can be served from it
+            keywords = next(self.rake.run_many([text]))
+            with self._lock:
+                self._store(key, keywords)
+
+        # keywords are sorted and ties keep their order, so the top k of
+        # `Rake.run` are a prefix
+        top_k = _limit(len(keywords), top_k, top_fraction)
+        return keywords[:top_k]
+
+    def cache_info(self):
+        """Hit and miss counters, like `functools.lru_cache`.
+
+        `hits` are served from memory, `disk_hits` from the sqlite tier.
+        """
+        with self._lock:
+            return CacheInfo(self.hits, self.disk_hits, self.misses,
+                             self.maxsize, len(self._memory))
+
+    def cache_clear(self):
+        """Empty both tiers and reset the counters."""
+        with self._lock:
+            self._memory.clear()
+            self.hits = self.disk_hits = self.misses = 0
+            if self._db is not None:
+                with self._db:
+                    self._db.execute('DELETE FROM keywords')
+
+    def close(self):
+        """Close the sqlite database, if any."""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
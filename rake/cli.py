@@ -0,0 +1,260 @@
+"""
+`rake` console command: bulk keyword extraction from files, directories,
+glob patterns or stdin.
+
+Documents are read lazily and results are written as soon as they are ready,
+one JSON object per line, so memory use does not grow with the size of the
+input. Run `rake --help` for the options.
+"""
+
+import argparse
+import glob
+import io
+import json
+import os
+import sys
+import time
+from collections import deque
+from contextlib import nullcontext
+
+from .idf import IdfIndex
+from .parallel import ParallelRake
+from .rake import Rake
+from .stoplists import get_stopwords, stopword_sources
+
+
+def _expand(inputs):
+    """Paths of the files named by `inputs`, with directories walked and globs matched.
+
+    Raises ValueError for inputs that name no file.
+    """
+    paths = []
+    for name in inputs:
+        if name == '-' or os.path.isfile(name):
+            paths.append(name)
+        elif os.path.isdir(name):
+            for root, dirs, files in os.walk(name):
+                dirs.sort()
+                paths.extend(os.path.join(root, f) for f in sorted(files))
+        elif any(c in name for c in '*?['):
+            matches = sorted(path for path in glob.glob(name, recursive=True)
+                             if os.path.isfile(path))
+            if not matches:
+                raise ValueError('No files match {}'.format(name))
+            paths.extend(matches)
+        else:
+            raise ValueError('No such file or directory: {}'.format(name))
+    return paths
+
+
+def _open(path):
+    # binary file object; stdin is left open
+    if path == '-':
+        return nullcontext(sys.stdin.buffer)
+    return open(path, 'rb')
+
+
+def _run_stdin(rake, encoding, top_k):
+    with _open('-') as f:
+        stream = io.TextIOWrapper(f, encoding=encoding)
+        try:
+            return rake.run_stream(stream, top_k=top_k)
+        finally:
+            stream.detach()
+
+
+def _line_documents(paths, encoding, jsonl, text_field, id_field):
+    """Yield `(record, n_bytes, text)` for every non-blank line of every file.
+
+    Raises ValueError, naming the line, for lines that cannot be decoded or
+    parsed, and for JSONL documents whose text is not a string or a list of
+    strings.
+    """
+    for path in paths:
+        with _open(path) as f:
+            for line_number, line in enumerate(f, 1):
+                try:
+                    text = line.decode(encoding)
+                    if not text.strip():
+                        continue
+                    record = {'source': path, 'line': line_number}
+                    if jsonl:
+                        document = json.loads(text)
+                        if id_field in document:
+                            record['id'] = document[id_field]
+                        text = document[text_field]
+                        tokens = text if isinstance(text, list) else [text]
+                        if not all(isinstance(token, str) for token in tokens):
+                            raise TypeError('{!r} is not a string or a list of strings'.format(
+                                text_field))
+                except (ValueError, KeyError, TypeError) as e:
+                    raise ValueError('{}:{}: {!r}'.format(path, line_number, e))
+                yield record, len(line), text
+
+
+class _Progress(object):
+    # throughput line on stderr, rewritten at most every `interval` seconds
+
+    def __init__(self, stream, interval=1.0, clock=time.time):
+        self.stream = stream
+        self.interval = interval
+        self.clock = clock
+        self.documents = 0
+        self.bytes = 0
+        self.start = self.last = clock()
+
+    def update(self, n_bytes):
+        self.documents += 1
+        self.bytes += n_bytes
+        now = self.clock()
+        if now - self.last >= self.interval:
+            self.last = now
+            self._write(now, '\r')
+
+    def close(self):
+        self._write(self.clock(), '\r')
+        self.stream.write('\n')
+        self.stream.flush()
+
+    def _write(self, now, prefix):
+        elapsed = max(now - self.start, 1e-9)
+        self.stream.write('{}{} documents, {:.1f} MB, {:.1f} documents/s, {:.2f} MB/s'.format(
+            prefix, self.documents, self.bytes / 1e6,
+            self.documents / elapsed, self.bytes / 1e6 / elapsed))
+        self.stream.flush()
+
+
+def _extract(args, rake, paths):
+    """Yield `(record, n_bytes, keywords)` for every document, in input order."""
+    top_k = args.top_k or None
+    if args.format == 'text':
+        sizes = (0 if path == '-' else os.path.getsize(path) for path in paths)
+        if args.jobs == 1:
+            results = (_run_stdin(rake, args.encoding, top_k) if path == '-'
+                       else rake.run_file(path, encoding=args.encoding, top_k=top_k)
+                       for path in paths)
+        else:
+            parallel = ParallelRake(rake, processes=args.jobs, chunksize=1)
+            results = parallel.run_files(paths, top_k=top_k, encoding=args.encoding)
+        for path, size, keywords in zip(paths, sizes, results):
+            yield {'source': path}, size, keywords
+        return
+
+    # records of the documents handed to the extractor but not yet yielded;
+    # results come back in input order, so this never outgrows the number
+    # of documents in flight
+    pending = deque()
+
+    def texts():
+        for record, size, text in _line_documents(paths, args.encoding, args.format == 'jsonl',
+                                                  args.text_field, args.id_field):
+            pending.append((record, size))
+            yield text
+
+    if args.jobs == 1:
+        results = rake.run_many(texts(), top_k=top_k)
+    else:
+        parallel = ParallelRake(rake, processes=args.jobs, chunksize=args.chunksize)
+        results = parallel.run_many(texts(), top_k=top_k)
+    for keywords in results:
+        record, size = pending.popleft()
+        yield record, size, keywords
+
+
+def _parser():
+    parser = argparse.ArgumentParser(
+        prog='rake',
+        description='Extract keywords with RAKE and write one JSON object per document.')
+    parser.add_argument('inputs', nargs='*', metavar='INPUT',
+                        help='files, directories or glob patterns to read; - or nothing reads stdin')
+    parser.add_argument('-f', '--format', choices=['text', 'lines', 'jsonl'],
+                        help='text: every file is one document (the default for files); '
+                             'lines: every line is a document (the default for stdin); '
+                             'jsonl: every line is a JSON object holding a document')
+    parser.add_argument('--text-field', default='text',
+                        help='field of the document text in JSONL input (default: %(default)s)')
+    parser.add_argument('--id-field', default='id',
+                        help='field copied to the output from JSONL input, if present '
+                             '(default: %(default)s)')
+    parser.add_argument('-k', '--top-k', type=int, default=10,
+                        help='number of keywords per document, 0 for all (default: %(default)s)')
+    parser.add_argument('-s', '--stoplist', default='fox', metavar='NAME',
+                        help='registered stopword list: {} (default: %(default)s)'.format(
+                            ', '.join(stopword_sources())))
+    parser.add_argument('--backend', choices=['python', 'numpy'], default='python',
+                        help='scoring backend (default: %(default)s)')
+    parser.add_argument('--adjoining', action='store_true',
+                        help='also extract recurring keywords joined by a stopword, eg. "axis of evil"')
+    parser.add_argument('--idf', metavar='PATH',
+                        help='IDF index (see rake.idf) to weight keyword scores with')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='number of worker processes, 0 for one per CPU (default: %(default)s)')
+    parser.add_argument('--chunksize', type=int, default=256,
+                        help='lines sent to a worker at a time (default: %(default)s)')
+    parser.add_argument('--encoding', default='utf-8',
+                        help='encoding of the input (default: %(default)s)')
+    parser.add_argument('-o', '--output', help='write results to this file instead of stdout')
+    progress = parser.add_mutually_exclusive_group()
+    progress.add_argument('--progress', action='store_true', default=None,
+                          help='report throughput on stderr (the default when stderr is a terminal)')
+    progress.add_argument('-q', '--quiet', dest='progress', action='store_false',
+                          help='do not report throughput')
+    return parser
+
+
+def main(argv=None):
+    parser = _parser()
+    args = parser.parse_args(argv)
+    if args.top_k < 0:
+        parser.error('--top-k must be non-negative')
+    if args.jobs < 0:
+        parser.error('--jobs must be non-negative')
+    args.jobs = args.jobs or os.cpu_count() or 1
+    try:
+        paths = _expand(args.inputs or ['-'])
+    except ValueError as e:
+        parser.error(str(e))
+    if args.format is None:
+        args.format = 'lines' if paths == ['-'] else 'text'
+    if args.format == 'text' and args.jobs > 1 and '-' in paths:
+        parser.error('stdin can only be read as text with --jobs 1')
+    if args.progress is None:
+        args.progress = sys.stderr.isatty()
+
+    try:
+        # read here, so that an unknown or unreadable list is a usage error
+        get_stopwords(args.stoplist)
+    except (OSError, ValueError) as e:
+        parser.error('{}; registered lists: {}'.format(e, ', '.join(stopword_sources())))
+    try:
+        idf = IdfIndex(args.idf) if args.idf else None
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    rake = Rake(args.stoplist, backend=args.backend, adjoining=args.adjoining, idf=idf)
+    output = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    progress = _Progress(sys.stderr) if args.progress else None
+    try:
+        for record, size, keywords in _extract(args, rake, paths):
+            record['keywords'] = [[kw.keyword, kw.score] for kw in keywords]
+            output.write(json.dumps(record, ensure_ascii=False) + '\n')
+            if progress is not None:
+                progress.update(size)
+        output.flush()
+    except BrokenPipeError:
+        # output closed early, eg. piped into `head`; silence the error
+        # Python would report when flushing stdout at exit
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    except (OSError, ValueError) as e:
+        sys.stderr.write('rake: error: {}\n'.format(e))
+        return 1
+    finally:
+        if progress is not None:
+            progress.close()
+        if output is not sys.stdout:
+            output.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
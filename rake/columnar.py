@@ -0,0 +1,203 @@
+"""
+Columnar container for the keywords of many documents.
+
+A `KeywordBatch` keeps a batch's results as flat typed arrays, one value per
+keyword per document, plus a table of the distinct keyword strings, so bulk
+results cost a few bytes per keyword instead of a namedtuple each. Batches
+are written to a binary file in one pass and read back by memory-mapping it:
+the columns of a read batch are views of the file and namedtuples are only
+built for the documents that are accessed.
+
+File layout (little-endian, every section 8-byte aligned):
+    header : magic, n_documents, n_rows, n_strings
+    doc_offsets : uint64 x (n_documents + 1)
+    sum_deg, sum_freq : int64 x n_rows each
+    score : float64 x n_rows
+    keyword_ids : uint32 x n_rows
+    string_offsets : uint64 x (n_strings + 1)
+    strings : the UTF-8 keyword strings, concatenated
+"""
+
+import mmap
+import struct
+import sys
+from array import array
+
+from ._binfile import aligned, atomic_write, from_bytes, to_bytes, write_aligned
+from .rake import KeywordScore
+
+_MAGIC = b'RAKECOL\x01'
+_HEADER = struct.Struct('<8sQQQ')
+
+
+class KeywordBatch(object):
+    """Keywords of a batch of documents, in columnar arrays.
+
+    Build one with `Rake.run_batch`, or by appending `Rake.run` results.
+    Indexing and iterating give each document's keywords as namedtuples, the
+    same as `Rake.run`. The columns support the buffer protocol, eg. for
+    `numpy.frombuffer`.
+
+    Parameters
+    ----------
+    path : string or None, default=None
+            If given, the batch written at `path` by `write` is memory-mapped,
+            read-only, instead of starting an empty batch
+
+    Attributes
+    ----------
+    doc_offsets : sequence of ints, len=n_documents + 1
+            The keywords of document i are rows doc_offsets[i] to
+            doc_offsets[i + 1] of the other columns
+    keyword_ids : sequence of ints, len=n_rows
+            Id of each row's keyword in the string table, see `keyword`
+    sum_deg, sum_freq : sequence of ints, len=n_rows
+    score : sequence of floats, len=n_rows
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self._map = None
+        if path is not None:
+            self._read(path)
+            return
+        self.doc_offsets = array('Q', [0])
+        self.keyword_ids = array('I')
+        self.sum_deg = array('q')
+        self.sum_freq = array('q')
+        self.score = array('d')
+        self._strings = []
+        self._string_ids = {}
+
+    def _read(self, path):
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) < _HEADER.size:
+            raise ValueError('{} is not a keyword batch'.format(path))
+        magic, n_documents, n_rows, n_strings = _HEADER.unpack_from(self._map)
+        if magic != _MAGIC:
+            raise ValueError('{} is not a keyword batch'.format(path))
+
+        self._views = [memoryview(self._map)]
+        offset = _HEADER.size
+        columns = []
+        for typecode, size, n in (('Q', 8, n_documents + 1), ('q', 8, n_rows), ('q', 8, n_rows),
+                                  ('d', 8, n_rows), ('I', 4, n_rows), ('Q', 8, n_strings + 1)):
+            end = offset + size * n
+            if sys.byteorder == 'little':
+                column = self._views[0][offset:end].cast(typecode)
+                self._views.append(column)
+            else:
+                column = from_bytes(typecode, self._map[offset:end])
+            columns.append(column)
+            offset = aligned(end)
+        (self.doc_offsets, self.sum_deg, self.sum_freq, self.score, self.keyword_ids,
+         self._string_offsets) = columns
+        self._strings_start = offset
+
+    def __len__(self):
+        return len(self.doc_offsets) - 1
+
+    def __getitem__(self, i):
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError('document {} out of range'.format(i))
+        keyword = self.keyword
+        keyword_ids, sum_deg, sum_freq, score = self.keyword_ids, self.sum_deg, self.sum_freq, self.score
+        return [KeywordScore(keyword=keyword(keyword_ids[r]), sum_deg=sum_deg[r],
+                             sum_freq=sum_freq[r], score=score[r])
+                for r in range(self.doc_offsets[i], self.doc_offsets[i + 1])]
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def n_rows(self):
+        """Number of keywords over all documents."""
+        return len(self.keyword_ids)
+
+    @property
+    def n_strings(self):
+        """Number of distinct keywords in the string table."""
+        if self._map is not None:
+            return len(self._string_offsets) - 1
+        return len(self._strings)
+
+    def keyword(self, keyword_id):
+        """Keyword string number `keyword_id` of the string table."""
+        if self._map is None:
+            return self._strings[keyword_id]
+        start = self._strings_start + self._string_offsets[keyword_id]
+        end = self._strings_start + self._string_offsets[keyword_id + 1]
+        return self._map[start:end].decode('utf-8', 'surrogatepass')
+
+    def _append_rows(self, selected, keywords, sum_deg, sum_freq, score):
+        # one document from the columns of `_ScoreTable.keyword_rows`
+        if self._map is not None:
+            raise ValueError('{} is mapped read-only'.format(self.path))
+        strings = self._strings
+        string_ids = self._string_ids
+        keyword_ids = self.keyword_ids
+        for p in selected:
+            keyword = keywords[p]
+            i = string_ids.get(keyword)
+            if i is None:
+                i = string_ids[keyword] = len(strings)
+                strings.append(keyword)
+            keyword_ids.append(i)
+        self.sum_deg.extend([sum_deg[p] for p in selected])
+        self.sum_freq.extend([sum_freq[p] for p in selected])
+        self.score.extend([score[p] for p in selected])
+        self.doc_offsets.append(len(keyword_ids))
+
+    def append(self, keywords):
+        """Add the keywords of the next document, eg. the result of `Rake.run`."""
+        self._append_rows(range(len(keywords)), [kw.keyword for kw in keywords],
+                          [kw.sum_deg for kw in keywords], [kw.sum_freq for kw in keywords],
+                          [kw.score for kw in keywords])
+
+    def extend(self, results):
+        """Add the keywords of every document of `results`, eg. `Rake.run_many(docs)`."""
+        for keywords in results:
+            self.append(keywords)
+        return self
+
+    def write(self, path):
+        """Write the batch to `path`, replacing it atomically."""
+        if self._map is not None:
+            strings = [self.keyword(i).encode('utf-8', 'surrogatepass')
+                       for i in range(self.n_strings)]
+        else:
+            strings = [keyword.encode('utf-8', 'surrogatepass') for keyword in self._strings]
+        string_offsets = array('Q', [0])
+        for string in strings:
+            string_offsets.append(string_offsets[-1] + len(string))
+
+        with atomic_write(path) as f:
+            f.write(_HEADER.pack(_MAGIC, len(self), self.n_rows, len(strings)))
+            for typecode, column in (('Q', self.doc_offsets), ('q', self.sum_deg),
+                                     ('q', self.sum_freq), ('d', self.score),
+                                     ('I', self.keyword_ids), ('Q', string_offsets)):
+                # arrays and mapped columns both export their raw bytes
+                write_aligned(f, to_bytes(column, typecode))
+            f.write(b''.join(strings))
+
+    def close(self):
+        """Unmap the file of a batch read from `path`.
+
+        Fails with BufferError while other objects, eg. NumPy arrays, still
+        use the columns.
+        """
+        if self._map is not None:
+            for view in reversed(self._views):
+                view.release()
+            self._map.close()
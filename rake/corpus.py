@@ -0,0 +1,86 @@
+"""
+Corpus-level RAKE: word degree and frequency accumulated over many documents.
+
+Each document contributes its candidate keywords to shared tables, so corpus
+scores are the same as running `Rake` on every candidate of the collection
+at once, without ever holding the collection's text in memory.
+"""
+
+from .rake import Rake, _ScoreTable
+
+
+class CorpusRake(object):
+    """Accumulate RAKE statistics over a collection of documents.
+
+    Parameters
+    ----------
+    rake : Rake or None, default=None
+            Extractor used to generate candidate keywords for each document,
+            and adjoining keywords if it has `adjoining` set. If None, uses
+            `Rake()`
+
+    Attributes
+    ----------
+    n_documents : int
+            Number of documents added so far
+    phrase_counts : dict
+            Number of occurrences of each candidate keyword across the corpus
+    """
+
+    def __init__(self, rake=None):
+        self.rake = rake if rake is not None else Rake()
+        self.n_documents = 0
+        self._table = _ScoreTable(self.rake._backend)
+
+    @property
+    def phrase_counts(self):
+        table = self._table
+        return dict(zip(table.keywords, table.phrase_counts))
+
+    def add(self, text):
+        """Fold one document (string or tokenized list) into the corpus tables.
+
+        Any other document raises TypeError and leaves the tables unchanged.
+        """
+        table = self._table
+        table.add(self.rake._generate_candidate_keywords(
+            text, adjoining=table.adjoining if self.rake.adjoining else None))
+        self.n_documents += 1
+        return self
+
+    def add_many(self, docs):
+        """Fold every document of `docs` into the corpus tables."""
+        for text in docs:
+            self.add(text)
+        return self
+
+    def merge(self, other):
+        """Fold the tables of another `CorpusRake`, eg. from another shard, into this one.
+
+        Both accumulators must use the same stopwords and delimiters.
+        """
+        if self.rake._pipeline != other.rake._pipeline:
+            raise ValueError('Cannot merge corpora built with different stopwords or delimiters')
+        self._table.merge(other._table)
+        self.n_documents += other.n_documents
+        return self
+
+    def word_scores(self):
+        """Corpus-wide word scores, in descending order of score (deg(w) / freq(w))
+
+        Returns
+        -------
+        sorted_word_scores : list of namedtuples, len=n_words
+        """
+        return sorted(self._table.word_scores(), key=lambda x: x.score, reverse=True)
+
+    def keyword_scores(self):
+        """Corpus-wide keyword scores, in descending order of score (sum of word scores)
+
+        Scores are weighted by the `idf` index of `rake`, if any.
+
+        Returns
+        -------
+        sorted_keywords : list of namedtuples, len=n_keywords
+        """
+        return self._table.keyword_scores(weight=self.rake._weight)
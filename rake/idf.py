@@ -0,0 +1,214 @@
+"""
+Persistent document-frequency index of RAKE candidates, for down-weighting
+keywords that are common across a corpus.
+
+`IdfIndexBuilder` counts, over a corpus, the documents each candidate phrase
+and each word appears in, and writes them to a single file holding an
+open-addressing hash table. `IdfIndex` memory-maps that file, so any number
+of worker processes share one copy in the page cache and each lookup costs a
+hash and, usually, one probe. Pass an index as `Rake(idf=...)` to multiply
+every keyword score by the IDF of the keyword. Adjoining keywords are
+counted when the builder's `Rake` has `adjoining` set; otherwise they are
+absent from the index and get the highest IDF.
+
+File layout (little-endian):
+    header : magic, n_documents, n_slots, n_terms, digest of the rest
+    slots : n_slots x (crc32 of key, document frequency, key offset),
+            empty slots have a frequency of 0
+    keys : a kind byte (b'p' phrase, b'w' word) and the UTF-8 term, each
+            prefixed with its length
+"""
+
+import hashlib
+import math
+import mmap
+import struct
+import zlib
+
+from ._binfile import atomic_write
+from .rake import Rake, _ADJOINING_MIN_COUNT
+
+_MAGIC = b'RAKEIDF\x01'
+_HEADER = struct.Struct('<8sQQQ16s')
+_SLOT = struct.Struct('<IIQ')
+_LENGTH = struct.Struct('<I')
+
+
+def _key(kind, term):
+    return kind + term.encode('utf-8', 'surrogatepass')
+
+
+class IdfIndexBuilder(object):
+    """Count the documents each candidate phrase and word of a corpus appears in.
+
+    Parameters
+    ----------
+    rake : Rake or None, default=None
+            Extractor used to generate candidate keywords for each document,
+            and the adjoining keywords `Rake.run` would return if it has
+            `adjoining` set. If None, uses `Rake()`
+
+    Attributes
+    ----------
+    n_documents : int
+            Number of documents added so far
+    """
+
+    def __init__(self, rake=None):
+        self.rake = rake if rake is not None else Rake()
+        self.n_documents = 0
+        self._frequencies = {}
+
+    def add(self, text):
+        """Count the candidates of one document (string or tokenized list).
+
+        Any other document raises TypeError and leaves the counts unchanged.
+        """
+        adjoining = {} if self.rake.adjoining else None
+        phrases = set(self.rake._generate_candidate_keywords(text, adjoining=adjoining))
+        words = {word for phrase in phrases for word in phrase.split()}
+        if adjoining:
+            phrases.update(' '.join(key) for key, count in adjoining.items()
+                           if count >= _ADJOINING_MIN_COUNT)
+        frequencies = self._frequencies
+        for key in [_key(b'p', phrase) for phrase in phrases] + [_key(b'w', word) for word in words]:
+            frequencies[key] = frequencies.get(key, 0) + 1
+        self.n_documents += 1
+        return self
+
+    def add_many(self, docs):
+        """Count the candidates of every document of `docs`."""
+        for text in docs:
+            self.add(text)
+        return self
+
+    def merge(self, other):
+        """Fold the counts of another `IdfIndexBuilder`, eg. from another shard, into this one."""
+        if (self.rake._pipeline, self.rake.adjoining) != (other.rake._pipeline, other.rake.adjoining):
+            raise ValueError('Cannot merge indexes built with different stopwords, delimiters '
+                             'or adjoining settings')
+        frequencies = self._frequencies
+        for key, count in other._frequencies.items():
+            frequencies[key] = frequencies.get(key, 0) + count
+        self.n_documents += other.n_documents
+        return self
+
+    def write(self, path):
+        """Write the index to `path`, replacing it atomically, and return it opened.
+
+        Returns
+        -------
+        index : IdfIndex
+        """
+        frequencies = self._frequencies
+        # at most half full, so probe sequences stay short
+        n_slots = 8
+        while n_slots < 2 * len(frequencies):
+            n_slots *= 2
+        mask = n_slots - 1
+
+        slots = bytearray(n_slots * _SLOT.size)
+        keys = bytearray()
+        keys_offset = _HEADER.size + len(slots)
+        for key, count in frequencies.items():
+            h = zlib.crc32(key)
+            i = h & mask
+            while _SLOT.unpack_from(slots, i * _SLOT.size)[1]:
+                i = (i + 1) & mask
+            _SLOT.pack_into(slots, i * _SLOT.size, h, count, keys_offset + len(keys))
+            keys += _LENGTH.pack(len(key))
+            keys += key
+
+        body = bytes(slots) + bytes(keys)
+        digest = hashlib.blake2b(body, digest_size=16,
+                                 key=struct.pack('<QQ', self.n_documents, n_slots)).digest()
+        header = _HEADER.pack(_MAGIC, self.n_documents, n_slots, len(frequencies), digest)
+        with atomic_write(path) as f:
+            f.write(header)
+            f.write(body)
+        return IdfIndex(path)
+
+
+class IdfIndex(object):
+    """Read-only, memory-mapped document-frequency index written by `IdfIndexBuilder`.
+
+    Instances can be pickled, eg. inside a `Rake` sent to worker processes;
+    each process maps the file again.
+
+    Parameters
+    ----------
+    path : string
+            Path of the index file
+
+    Attributes
+    ----------
+    n_documents : int
+            Number of documents the index was built from
+    digest : bytes
+            Checksum of the index contents, which identifies it eg. in
+            cache keys
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._open()
+
+    def _open(self):
+        with open(self.path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) < _HEADER.size:
+            raise ValueError('{} is not an IDF index'.format(self.path))
+        magic, self.n_documents, self._n_slots, self._n_terms, self.digest = \
+            _HEADER.unpack_from(self._map)
+        if magic != _MAGIC:
+            raise ValueError('{} is not an IDF index'.format(self.path))
+        self._mask = self._n_slots - 1
+
+    def __getstate__(self):
+        return {'path': self.path}
+
+    def __setstate__(self, state):
+        self.path = state['path']
+        self._open()
+
+    def __len__(self):
+        return self._n_terms
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self._map.close()
+
+    def _frequency(self, key):
+        mapped = self._map
+        h = zlib.crc32(key)
+        i = h & self._mask
+        while True:
+            slot_hash, count, offset = _SLOT.unpack_from(mapped, _HEADER.size + i * _SLOT.size)
+            if not count:
+                return 0
+            if slot_hash == h:
+                start = offset + _LENGTH.size
+                if mapped[start:start + _LENGTH.unpack_from(mapped, offset)[0]] == key:
+                    return count
+            i = (i + 1) & self._mask
+
+    def phrase_frequency(self, phrase):
+        """Number of documents `phrase` is a candidate keyword of."""
+        return self._frequency(_key(b'p', phrase))
+
+    def word_frequency(self, word):
+        """Number of documents with a candidate keyword containing `word`."""
+        return self._frequency(_key(b'w', word))
+
+    def idf(self, phrase):
+        """Smoothed inverse document frequency of `phrase`, as in scikit-learn.
+
+        log((1 + n_documents) / (1 + df)) + 1, so unseen phrases get the
+        highest weight and no weight is below 1.
+        """
+        return math.log((1 + self.n_documents) / (1 + self.phrase_frequency(phrase))) + 1
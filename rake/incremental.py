@@ -0,0 +1,85 @@
+"""
+Incremental RAKE for documents that keep growing, eg. chat transcripts.
+
+Appending text only scans the new text, carrying over the token and phrase
+left open at the end of the previous text; the degree/frequency tables are
+kept up to date between calls and a query only rescores what changed since
+the previous one, so the cost of extraction no longer grows with the length
+of the history.
+"""
+
+from .rake import Rake, _CandidateStream, _IncrementalScoreTable
+
+
+class IncrementalRake(object):
+    """Keywords of a document that is extended with `append`.
+
+    After any sequence of `append` calls, `keyword_scores` and `word_scores`
+    are the same as `Rake.run` and `Rake.word_scores` for the concatenated
+    text, including the `adjoining` and `idf` options of `rake`.
+
+    Parameters
+    ----------
+    rake : Rake or None, default=None
+            Extractor whose configuration is used. If None, uses `Rake()`
+
+    Attributes
+    ----------
+    length : int
+            Number of characters appended so far
+    """
+
+    def __init__(self, rake=None):
+        self.rake = rake if rake is not None else Rake()
+        self.length = 0
+        self._table = _IncrementalScoreTable()
+        self._candidates = _CandidateStream(
+            self.rake._pipeline, self._table, self._table.adjoining if self.rake.adjoining else None)
+
+    def append(self, text):
+        """Extend the document with `text`."""
+        self._candidates.feed(text)
+        self.length += len(text)
+        return self
+
+    def _query(self, scores):
+        # the last token may still be extended by the next append, so its
+        # candidates are only counted for the duration of this query
+        table = self._table
+        n_words, n_phrases = len(table.words), len(table.keywords)
+        adjoining = {} if self.rake.adjoining else None
+        pending = self._candidates.pending(adjoining)
+        table.add(pending)
+        if adjoining:
+            table.count_adjoining(adjoining)
+        try:
+            return scores(table)
+        finally:
+            if adjoining:
+                table.count_adjoining(adjoining, -1)
+            table.remove(pending)
+            table.truncate(n_words, n_phrases)
+
+    def keyword_scores(self, top_k=None, top_fraction=None):
+        """Current keyword scores
+
+        Parameters
+        ----------
+        top_k, top_fraction : see `Rake.run`
+
+        Returns
+        -------
+        sorted_keywords : list of namedtuples, len=n_keywords
+        """
+        weight = self.rake._weight
+        return self._query(lambda table: table.keyword_scores(
+            top_k=top_k, top_fraction=top_fraction, weight=weight))
+
+    def word_scores(self):
+        """Current word scores, in the order of `Rake.word_scores`
+
+        Returns
+        -------
+        word_scores : list of namedtuples, len=n_words
+        """
+        return self._query(lambda table: table.word_scores())
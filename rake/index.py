@@ -0,0 +1,361 @@
+"""
+Inverted index from keywords to the documents they were extracted from.
+
+`KeywordIndexBuilder` consumes `Rake` results, one keyword list per document,
+and writes a single file that `KeywordIndex` memory-maps to answer "which
+documents have keyword X", "best documents for X" and "top keywords of the
+documents matching X" without holding any results in memory.
+
+File layout (little-endian, every section 8-byte aligned):
+    header : magic, n_documents, n_terms, offsets of the sections below
+    dictionary : one fixed-size entry per term, sorted by term, for binary
+            search: term offset and length, postings offset, number of
+            postings, number of top postings, size of the doc id deltas
+    terms : the UTF-8 terms, concatenated in sorted order
+    postings : per term, the top postings by score as (doc id, score) pairs,
+            then the scores of all postings in doc id order, then their doc
+            ids as varint-encoded deltas
+    forward : optional; per document, the term ids and scores of its
+            keywords, as offsets into a term id array and a score array
+"""
+
+import heapq
+import mmap
+import struct
+from array import array
+from itertools import accumulate
+
+from ._binfile import aligned, atomic_write, from_bytes, to_bytes, write_aligned
+
+_MAGIC = b'RAKEIDX\x01'
+_HEADER = struct.Struct('<8sQQQQQQ')
+_ENTRY = struct.Struct('<QQIIII')
+_TOP = struct.Struct('<Qd')
+
+
+def _append_varint(buffer, n):
+    while n > 0x7f:
+        buffer.append(n & 0x7f | 0x80)
+        n >>= 7
+    buffer.append(n)
+
+
+def _decode_deltas(data):
+    # doc ids from varint-encoded deltas; the first delta is from doc id -1,
+    # so every delta is at least 1
+    if not data or max(data) < 0x80:
+        # every delta fits in one byte, as for all but rare keywords
+        return array('q', accumulate(data, initial=-1))[1:]
+    doc_ids = array('q')
+    doc_id = -1
+    n = shift = 0
+    for byte in data:
+        n |= (byte & 0x7f) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            doc_id += n
+            doc_ids.append(doc_id)
+            n = shift = 0
+    return doc_ids
+
+
+class KeywordIndexBuilder(object):
+    """Collect the keywords of a document collection into an inverted index.
+
+    Documents are numbered 0, 1, ... in the order they are added.
+
+    Parameters
+    ----------
+    forward : bool, default=True
+            Also store every document's keywords, which `KeywordIndex.keywords`
+            and `KeywordIndex.top_keywords` need
+    top_size : int, default=64
+            Number of highest scoring postings stored separately for each
+            keyword, which answer `KeywordIndex.top_documents` for up to that
+            many documents without decoding the whole posting list
+
+    Attributes
+    ----------
+    n_documents : int
+            Number of documents added so far
+    """
+
+    def __init__(self, forward=True, top_size=64):
+        if top_size < 0:
+            raise ValueError('top_size must be non-negative, got {}'.format(top_size))
+        self.forward = forward
+        self.top_size = top_size
+        self.n_documents = 0
+        # keyword: id, in first-seen order
+        self._index = {}
+        self._terms = []
+        # per keyword id: doc id deltas, scores and last doc id
+        self._deltas = []
+        self._scores = []
+        self._last = array('q')
+        # per document: its keyword ids and scores, if `forward`
+        self._forward_ends = array('Q', [0])
+        self._forward_terms = array('I')
+        self._forward_scores = array('d')
+
+    def add(self, keywords):
+        """Add the keywords of the next document and return its doc id.
+
+        Parameters
+        ----------
+        keywords : list of namedtuples or (keyword, score) pairs
+                Result of `Rake.run` for the document
+        """
+        doc_id = self.n_documents
+        index = self._index
+        for kw in keywords:
+            keyword, score = kw[0], kw[-1]
+            i = index.get(keyword)
+            if i is None:
+                i = index[keyword] = len(self._terms)
+                self._terms.append(keyword)
+                self._deltas.append(bytearray())
+                self._scores.append(array('d'))
+                self._last.append(-1)
+            elif self._last[i] == doc_id:
+                # repeated keyword, keep the first score
+                continue
+            _append_varint(self._deltas[i], doc_id - self._last[i])
+            self._scores[i].append(score)
+            self._last[i] = doc_id
+            if self.forward:
+                self._forward_terms.append(i)
+                self._forward_scores.append(score)
+        if self.forward:
+            self._forward_ends.append(len(self._forward_terms))
+        self.n_documents += 1
+        return doc_id
+
+    def add_many(self, results):
+        """Add the keywords of every document of `results`, eg. `Rake.run_many(docs)`."""
+        for keywords in results:
+            self.add(keywords)
+        return self
+
+    def write(self, path):
+        """Write the index to `path`, replacing it atomically, and return it opened.
+
+        Returns
+        -------
+        index : KeywordIndex
+        """
+        terms = self._terms
+        order = sorted(range(len(terms)), key=terms.__getitem__)
+        encoded = [terms[i].encode('utf-8', 'surrogatepass') for i in order]
+
+        entries_offset = _HEADER.size
+        terms_offset = entries_offset + _ENTRY.size * len(terms)
+        postings_offset = aligned(terms_offset + sum(len(term) for term in encoded))
+
+        with atomic_write(path) as f:
+            f.seek(postings_offset)
+            entries = bytearray()
+            term_offset = terms_offset
+            offset = postings_offset
+            for i, term in zip(order, encoded):
+                deltas, scores = self._deltas[i], self._scores[i]
+                # the first postings by score, ties by doc id, as `top_documents` returns them
+                if self.top_size and len(scores) > 1:
+                    doc_ids = _decode_deltas(deltas)
+                    best = heapq.nsmallest(self.top_size, range(len(scores)),
+                                           key=lambda j: (-scores[j], j))
+                    top = b''.join(_TOP.pack(doc_ids[j], scores[j]) for j in best)
+                else:
+                    top = b''
+                block = top + to_bytes(scores) + bytes(deltas)
+                entries += _ENTRY.pack(term_offset, offset, len(scores),
+                                       len(top) // _TOP.size, len(term), len(deltas))
+                term_offset += len(term)
+                offset += write_aligned(f, block)
+
+            forward_offset = 0
+            if self.forward:
+                forward_offset = offset
+                remap = array('I', [0]) * len(terms)
+                for new, old in enumerate(order):
+                    remap[old] = new
+                term_ids = array('I', [remap[i] for i in self._forward_terms])
+                for values in (self._forward_ends, self._forward_scores, term_ids):
+                    write_aligned(f, to_bytes(values))
+
+            f.seek(0)
+            f.write(_HEADER.pack(_MAGIC, self.n_documents, len(terms), entries_offset,
+                                 terms_offset, postings_offset, forward_offset))
+            f.write(entries)
+            f.write(b''.join(encoded))
+        return KeywordIndex(path)
+
+
+class KeywordIndex(object):
+    """Read-only, memory-mapped keyword index written by `KeywordIndexBuilder`.
+
+    Parameters
+    ----------
+    path : string
+            Path of the index file
+
+    Attributes
+    ----------
+    n_documents : int
+            Number of documents in the index
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) < _HEADER.size:
+            raise ValueError('{} is not a keyword index'.format(path))
+        (magic, self.n_documents, self._n_terms, self._entries_offset, self._terms_offset,
+         self._postings_offset, self._forward_offset) = _HEADER.unpack_from(self._map)
+        if magic != _MAGIC:
+            raise ValueError('{} is not a keyword index'.format(path))
+        if self._forward_offset:
+            # arrays of the forward table, see `KeywordIndexBuilder.write`
+            ends_size = 8 * (self.n_documents + 1)
+            self._forward_ends = self._forward_offset
+            (n_pairs,) = struct.unpack_from('<Q', self._map, self._forward_offset + ends_size - 8)
+            self._forward_scores = self._forward_offset + aligned(ends_size)
+            self._forward_terms = self._forward_scores + aligned(8 * n_pairs)
+
+    def __len__(self):
+        return self._n_terms
+
+    def __contains__(self, keyword):
+        return self._find(keyword) is not None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self._map.close()
+
+    def _entry(self, i):
+        return _ENTRY.unpack_from(self._map, self._entries_offset + i * _ENTRY.size)
+
+    def _term(self, entry):
+        return self._map[entry[0]:entry[0] + entry[4]]
+
+    def _bisect(self, key):
+        # first term id whose term is not less than `key`
+        lo, hi = 0, self._n_terms
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._term(self._entry(mid)) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _find(self, keyword):
+        key = keyword.encode('utf-8', 'surrogatepass')
+        i = self._bisect(key)
+        if i < self._n_terms:
+            entry = self._entry(i)
+            if self._term(entry) == key:
+                return entry
+        return None
+
+    def terms(self, prefix=''):
+        """Keywords in sorted order, only those starting with `prefix` if given."""
+        key = prefix.encode('utf-8', 'surrogatepass')
+        for i in range(self._bisect(key), self._n_terms):
+            term = self._term(self._entry(i))
+            if not term.startswith(key):
+                return
+            yield term.decode('utf-8', 'surrogatepass')
+
+    def document_frequency(self, keyword):
+        """Number of documents with `keyword`."""
+        entry = self._find(keyword)
+        return entry[2] if entry is not None else 0
+
+    def postings(self, keyword):
+        """Documents with `keyword` and its score in each, as two arrays in doc id order.
+
+        Returns
+        -------
+        doc_ids : array of ints
+        scores : array of floats
+        """
+        entry = self._find(keyword)
+        if entry is None:
+            return array('q'), array('d')
+        _, offset, n_postings, n_top, _, deltas_size = entry
+        start = offset + n_top * _TOP.size
+        scores = from_bytes('d', self._map[start:start + 8 * n_postings])
+        start += 8 * n_postings
+        return _decode_deltas(self._map[start:start + deltas_size]), scores
+
+    def lookup(self, keyword):
+        """Documents with `keyword`, as (doc id, score) pairs in doc id order.
+
+        Takes time linear in the number of documents; `top_documents`
+        answers from a fixed-size list for common keywords.
+        """
+        return list(zip(*self.postings(keyword)))
+
+    def top_documents(self, keyword, k=10):
+        """The `k` documents where `keyword` scores highest, as (doc id, score) pairs.
+
+        Ties are ordered by doc id.
+        """
+        entry = self._find(keyword)
+        if entry is None:
+            return []
+        _, offset, n_postings, n_top, _, _ = entry
+        if k <= n_top:
+            return list(_TOP.iter_unpack(self._map[offset:offset + k * _TOP.size]))
+        # `nsmallest` is stable, so ties keep doc id order
+        return heapq.nsmallest(k, self.lookup(keyword), key=lambda x: -x[1])
+
+    def keywords(self, doc_id):
+        """Keywords of one document, as (keyword, score) pairs in the order they were added."""
+        if not self._forward_offset:
+            raise ValueError('{} was written without a forward table'.format(self.path))
+        if not 0 <= doc_id < self.n_documents:
+            raise IndexError('doc id {} out of range'.format(doc_id))
+        start, end = struct.unpack_from('<QQ', self._map, self._forward_ends + 8 * doc_id)
+        scores = from_bytes('d', self._map[self._forward_scores + 8 * start:
+                                           self._forward_scores + 8 * end])
+        term_ids = from_bytes('I', self._map[self._forward_terms + 4 * start:
+                                             self._forward_terms + 4 * end])
+        return [(self._term(self._entry(i)).decode('utf-8', 'surrogatepass'), score)
+                for i, score in zip(term_ids, scores)]
+
+    def top_keywords(self, keyword, k=10, max_documents=None):
+        """Keywords with the highest total score over the documents with `keyword`.
+
+        Parameters
+        ----------
+        keyword : string
+                Keyword the documents must have; it is left out of the results
+        k : int, default=10
+                Number of keywords returned
+        max_documents : int or None, default=None
+                If given, only the documents where `keyword` scores highest
+                are used, which bounds the time taken for common keywords
+
+        Returns
+        -------
+        top_keywords : list of (keyword, total score) pairs, highest first
+        """
+        if max_documents is None:
+            doc_ids = self.postings(keyword)[0]
+        else:
+            doc_ids = [doc_id for doc_id, _ in self.top_documents(keyword, max_documents)]
+        totals = {}
+        for doc_id in doc_ids:
+            for term, score in self.keywords(doc_id):
+                totals[term] = totals.get(term, 0.0) + score
+        totals.pop(keyword, None)
+        return heapq.nlargest(k, totals.items(), key=lambda x: x[1])
@@ -0,0 +1,158 @@
+"""
+Multi-process keyword extraction for corpora too large for a single core.
+
+The configured `Rake` instance is shipped to each worker once, when the pool
+starts, and documents are then dispatched in chunks to amortise IPC.
+"""
+
+import multiprocessing
+from collections import deque
+from itertools import islice
+from queue import Queue
+
+from .rake import Rake
+
+# set in each worker process by `_init_worker`
+_worker_rake = None
+
+
+def _init_worker(rake):
+    global _worker_rake
+    _worker_rake = rake
+
+
+def _run_chunk(start, docs, top_k, top_fraction):
+    return start, list(_worker_rake.run_many(docs, top_k=top_k, top_fraction=top_fraction))
+
+
+def _run_file_chunk(start, paths, top_k, top_fraction, encoding):
+    return start, [_worker_rake.run_file(path, encoding=encoding, top_k=top_k,
+                                         top_fraction=top_fraction)
+                   for path in paths]
+
+
+def _completed(result):
+    if isinstance(result, BaseException):
+        raise result
+    start, results = result
+    for offset, keywords in enumerate(results):
+        yield start + offset, keywords
+
+
+def _chunks(docs, chunksize):
+    docs = iter(docs)
+    start = 0
+    while True:
+        chunk = list(islice(docs, chunksize))
+        if not chunk:
+            return
+        yield start, chunk
+        start += len(chunk)
+
+
+class ParallelRake(object):
+    """Run a `Rake` extractor over a corpus with a pool of worker processes.
+
+    Parameters
+    ----------
+    rake : Rake or None, default=None
+            Configured extractor to replicate in every worker.
+            If None, uses `Rake()`
+    processes : int or None, default=None
+            Number of worker processes. If None, uses the number of CPUs
+    chunksize : int, default=256
+            Number of documents sent to a worker per task
+    max_pending : int or None, default=None
+            Maximum number of chunks in flight at once, which bounds memory
+            when `docs` is a lazy iterable. If None, uses `2 * processes`
+    """
+
+    def __init__(self, rake=None, processes=None, chunksize=256, max_pending=None):
+        if chunksize < 1:
+            raise ValueError('chunksize must be at least 1, got {}'.format(chunksize))
+        self.rake = rake if rake is not None else Rake()
+        self.processes = processes or multiprocessing.cpu_count()
+        self.chunksize = chunksize
+        self.max_pending = max_pending or 2 * self.processes
+
+    def _pool(self):
+        return multiprocessing.Pool(self.processes,
+                                    initializer=_init_worker,
+                                    initargs=(self.rake,))
+
+    def run_many(self, docs, top_k=None, top_fraction=None, ordered=True):
+        """Runs the RAKE algorithm on every document in `docs` in parallel
+
+        Parameters
+        ----------
+        docs : iterable of strings or tokenized lists
+                Documents for keyword extraction, consumed lazily
+        top_k, top_fraction : see `Rake.run`, applied to each document
+        ordered : bool, default=True
+                If True, results are yielded in input order. If False, they are
+                yielded as soon as their chunk completes, paired with the
+                index of their document
+
+        Yields
+        ------
+        sorted_keywords : list of namedtuples, one list per document, or
+                `(index, sorted_keywords)` pairs when `ordered=False`
+        """
+        return self._run(_run_chunk, docs, (top_k, top_fraction), ordered)
+
+    def run_files(self, paths, top_k=None, top_fraction=None, encoding='utf-8', ordered=True):
+        """Runs the RAKE algorithm on every text file in `paths` in parallel
+
+        Workers read the files themselves with `Rake.run_file`, so neither
+        the parent process nor the pipes between processes ever hold a whole
+        document.
+
+        Parameters
+        ----------
+        paths : iterable of strings
+                Paths of the files, one document per file, consumed lazily
+        top_k, top_fraction, ordered : see `run_many`
+        encoding : string, default='utf-8'
+                Encoding of the files
+
+        Yields
+        ------
+        sorted_keywords : list of namedtuples, one list per file, or
+                `(index, sorted_keywords)` pairs when `ordered=False`
+        """
+        return self._run(_run_file_chunk, paths, (top_k, top_fraction, encoding), ordered)
+
+    def _run(self, task, items, args, ordered):
+        if ordered:
+            return self._run_ordered(task, items, args)
+        return self._run_unordered(task, items, args)
+
+    def _run_ordered(self, task, items, args):
+        with self._pool() as pool:
+            pending = deque()
+            for start, chunk in _chunks(items, self.chunksize):
+                if len(pending) >= self.max_pending:
+                    for keywords in pending.popleft().get()[1]:
+                        yield keywords
+                pending.append(pool.apply_async(task, (start, chunk) + args))
+            while pending:
+                for keywords in pending.popleft().get()[1]:
+                    yield keywords
+
+    def _run_unordered(self, task, items, args):
+        # completed chunks (or the exception that failed one) arrive here
+        # from the pool's result thread
+        done = Queue()
+        with self._pool() as pool:
+            in_flight = 0
+            for start, chunk in _chunks(items, self.chunksize):
+                if in_flight >= self.max_pending:
+                    for pair in _completed(done.get()):
+                        yield pair
+                    in_flight -= 1
+                pool.apply_async(task, (start, chunk) + args,
+                                 callback=done.put, error_callback=done.put)
+                in_flight += 1
+            for _ in range(in_flight):
+                for pair in _completed(done.get()):
+                    yield pair
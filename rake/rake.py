@@ -6,14 +6,854 @@ Automatic keyword extraction from indi-vidual documents.
 In M. W. Berry and J. Kogan (Eds.), Text Mining: Applications and Theory.unknown: John Wiley and Sons, Ltd.
 """
 
-import re
-from collections import Counter, namedtuple, defaultdict
-from string import punctuation, whitespace
+import codecs
+import heapq
+import mmap
+import os
+import time
+from array import array
+from collections import namedtuple
+
+from .stoplists import get_stopwords
+
+# `string.punctuation` and `string.whitespace`; importing `string` also
+# imports `re`, which dominated the import time of this package
+_PUNCTUATION = '!"#$%&\'()*+,-./:;<=>?@[\\]^_`{|}~'
+_WHITESPACE = ' \t\n\r\x0b\x0c'
 
 WordScore = namedtuple('WordScore', ['word', 'deg', 'freq', 'score'])
 KeywordScore = namedtuple(
     'KeywordScore', ['keyword', 'sum_deg', 'sum_freq', 'score'])
 
+# Everything `run` needs that depends only on the configuration, built once in
+# `Rake.__init__` and shared read-only by every subsequent call.
+_Pipeline = namedtuple(
+    '_Pipeline', ['stopwords', 'phrase_delimiters', 'word_delimiters', 'separator',
+                  'delimiter_table'])
+
+# adjoining keywords must recur to be kept, as in the paper
+_ADJOINING_MIN_COUNT = 2
+
+# characters of a string, or tokens of a list, that `Rake.run` scans at a time
+_SCAN_SIZE = 1 << 14
+
+# (phrase delimiters, word delimiters): the delimiter fields of `_Pipeline`,
+# shared by every `Rake` with the same delimiters
+_delimiter_fields = {}
+
+
+def _compile_delimiters(phrase_delimiters, word_delimiters):
+    key = (tuple(phrase_delimiters), tuple(word_delimiters))
+    fields = _delimiter_fields.get(key)
+    if fields is None:
+        separator = word_delimiters[0]
+        fields = _delimiter_fields[key] = (
+            frozenset(phrase_delimiters), tuple(word_delimiters), separator,
+            str.maketrans({i: separator for i in word_delimiters}))
+    return fields
+
+
+class RakeStats(object):
+    """Wall time and counts of each stage of `Rake.run`, aggregated over calls.
+
+    Pass an instance as `Rake(stats=...)`. Every `run` method records each
+    stage once per document; text read in chunks, eg. by `run_stream`, is
+    summed over its chunks. Any object with the same `record` method can be
+    used instead, eg. to forward every measurement to a metrics client.
+
+    Stages, and what their count measures:
+        tokenize : tokens
+        candidates : candidate keywords, after stopword and delimiter splitting
+            (includes interning them into the score table)
+        word_scores : unique words
+        phrase_scores : unique phrases
+    """
+
+    STAGES = ('tokenize', 'candidates', 'word_scores', 'phrase_scores')
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.calls = dict.fromkeys(self.STAGES, 0)
+        self.seconds = dict.fromkeys(self.STAGES, 0.0)
+        self.max_seconds = dict.fromkeys(self.STAGES, 0.0)
+        self.counts = dict.fromkeys(self.STAGES, 0)
+
+    def record(self, stage, seconds, count):
+        """Add one measurement of `stage`."""
+        self.calls[stage] += 1
+        self.seconds[stage] += seconds
+        self.counts[stage] += count
+        if seconds > self.max_seconds[stage]:
+            self.max_seconds[stage] = seconds
+
+    def as_dict(self):
+        """Aggregated stats as a JSON-serialisable dict keyed by stage."""
+        return {stage: {'calls': self.calls[stage],
+                        'seconds': self.seconds[stage],
+                        'max_seconds': self.max_seconds[stage],
+                        'count': self.counts[stage]}
+                for stage in self.STAGES}
+
+    def to_prometheus(self, prefix='rake'):
+        """Aggregated stats in the Prometheus text exposition format."""
+        lines = []
+        for name, kind, values in (('stage_calls_total', 'counter', self.calls),
+                                   ('stage_seconds_total', 'counter', self.seconds),
+                                   ('stage_max_seconds', 'gauge', self.max_seconds),
+                                   ('stage_items_total', 'counter', self.counts)):
+            lines.append('# TYPE {}_{} {}'.format(prefix, name, kind))
+            for stage in self.STAGES:
+                lines.append('{}_{}{{stage="{}"}} {!r}'.format(prefix, name, stage, values[stage]))
+        return '\n'.join(lines) + '\n'
+
+
+class _ScoreTable(object):
+    """Word degree/frequency tables and phrase counts for a run of candidates.
+
+    Words are interned to integer ids in first-seen order and each distinct
+    phrase is split only once, into a run of word ids in the flat
+    `phrase_words` array; a repeated phrase only bumps its count. Degrees,
+    frequencies and scores are then computed into typed arrays over the
+    distinct phrases, and namedtuples are only built for the results that are
+    actually returned. Tables for separate runs can be merged, which gives
+    the same result as building one table over the concatenated candidates.
+    """
+
+    def __init__(self, backend=None):
+        self.backend = backend
+        self.index = {}
+        self.words = []
+        self.phrase_index = {}
+        self.keywords = []
+        # word ids of every distinct phrase, concatenated; phrase p spans
+        # phrase_words[phrase_ends[p - 1]:phrase_ends[p]]
+        self.phrase_words = array('l')
+        self.phrase_ends = array('l')
+        self.phrase_counts = array('l')
+        # (keyword, stopword, keyword): number of times the two candidates
+        # appeared joined by that one stopword, see `_scan_adjoining`
+        self.adjoining = {}
+
+    def _intern_phrase(self, keyword, word_ids):
+        p = self.phrase_index[keyword] = len(self.keywords)
+        self.keywords.append(keyword)
+        self.phrase_words.extend(word_ids)
+        self.phrase_ends.append(len(self.phrase_words))
+        self.phrase_counts.append(0)
+        return p
+
+    def add(self, candidate_keywords):
+        index = self.index
+        words = self.words
+        phrase_index = self.phrase_index
+        phrase_counts = self.phrase_counts
+
+        for keyword in candidate_keywords:
+            p = phrase_index.get(keyword)
+            if p is None:
+                ids = []
+                for word in keyword.split():
+                    i = index.get(word)
+                    if i is None:
+                        i = index[word] = len(words)
+                        words.append(word)
+                    ids.append(i)
+                p = self._intern_phrase(keyword, ids)
+            phrase_counts[p] += 1
+
+    def remove(self, candidate_keywords):
+        """Undo `add` for candidates that were added before."""
+        phrase_index = self.phrase_index
+        phrase_counts = self.phrase_counts
+        for keyword in candidate_keywords:
+            p = phrase_index[keyword]
+            if not phrase_counts[p]:
+                raise ValueError('Candidate {!r} was not added'.format(keyword))
+            phrase_counts[p] -= 1
+
+    def remove_ids(self, phrase_ids):
+        """Undo `add` for candidates given by phrase id."""
+        phrase_counts = self.phrase_counts
+        for p in phrase_ids:
+            phrase_counts[p] -= 1
+
+    def compact(self):
+        """Forget phrases with a count of zero and words only they used.
+
+        Returns an array mapping old phrase ids to new ones, -1 for forgotten
+        phrases. Surviving phrases keep their relative order.
+        """
+        words = self.words
+        keywords = self.keywords
+        phrase_words = self.phrase_words
+        phrase_ends = self.phrase_ends
+        phrase_counts = self.phrase_counts
+        adjoining = self.adjoining
+        self.__init__(self.backend)
+        # adjoining keywords only join counted phrases, which are kept
+        self.adjoining = adjoining
+
+        phrase_remap = array('l', [-1]) * len(keywords)
+        index = self.index
+        start = 0
+        for p, (keyword, end, count) in enumerate(zip(keywords, phrase_ends, phrase_counts)):
+            if count:
+                ids = []
+                for i in phrase_words[start:end]:
+                    word = words[i]
+                    j = index.get(word)
+                    if j is None:
+                        j = index[word] = len(self.words)
+                        self.words.append(word)
+                    ids.append(j)
+                q = phrase_remap[p] = self._intern_phrase(keyword, ids)
+                self.phrase_counts[q] = count
+            start = end
+        return phrase_remap
+
+    def truncate(self, n_words, n_phrases):
+        """Forget the words and phrases interned after the first `n_words`/`n_phrases`.
+
+        Those phrases must have a count of zero, eg. after `remove`; this
+        restores the ids the next `add` will assign.
+        """
+        for keyword in self.keywords[n_phrases:]:
+            del self.phrase_index[keyword]
+        for word in self.words[n_words:]:
+            del self.index[word]
+        del self.keywords[n_phrases:]
+        del self.words[n_words:]
+        del self.phrase_counts[n_phrases:]
+        del self.phrase_ends[n_phrases:]
+        del self.phrase_words[self.phrase_ends[-1] if n_phrases else 0:]
+
+    def merge(self, other):
+        index = self.index
+        words = self.words
+
+        remap = []
+        for word in other.words:
+            i = index.get(word)
+            if i is None:
+                i = index[word] = len(words)
+                words.append(word)
+            remap.append(i)
+
+        start = 0
+        for keyword, end, count in zip(other.keywords, other.phrase_ends, other.phrase_counts):
+            p = self.phrase_index.get(keyword)
+            if p is None:
+                p = self._intern_phrase(
+                    keyword, [remap[i] for i in other.phrase_words[start:end]])
+            self.phrase_counts[p] += count
+            start = end
+
+        self.count_adjoining(other.adjoining)
+
+    def count_adjoining(self, counts, sign=1):
+        """Add adjoining counts, eg. from `_scan_adjoining`, or subtract them with a `sign` of -1."""
+        adjoining = self.adjoining
+        for key, count in counts.items():
+            count = adjoining.get(key, 0) + sign * count
+            if count:
+                adjoining[key] = count
+            else:
+                del adjoining[key]
+
+    def _phrases(self):
+        # (phrase id, word ids, count) of every phrase still counted
+        start = 0
+        phrase_words = self.phrase_words
+        for p, (end, count) in enumerate(zip(self.phrase_ends, self.phrase_counts)):
+            if count:
+                yield p, phrase_words[start:end], count
+            start = end
+
+    def word_tables(self):
+        """Degree, frequency and score arrays indexed by word id."""
+        if self.backend is not None:
+            return self.backend.word_tables(self)
+        n_words = len(self.words)
+        degree = array('l', [0]) * n_words
+        freq = array('l', [0]) * n_words
+        for _, ids, count in self._phrases():
+            phrase_degree = len(ids) * count
+            for i in ids:
+                degree[i] += phrase_degree
+                freq[i] += count
+        score = array('d', [round(deg / fr, 2) if fr else 0.0
+                            for deg, fr in zip(degree, freq)])
+        return degree, freq, score
+
+    def phrase_tables(self, degree, freq, score):
+        """Summed degree, frequency and score arrays indexed by phrase id."""
+        if self.backend is not None:
+            return self.backend.phrase_tables(self, degree, freq, score)
+        n_phrases = len(self.keywords)
+        sum_deg = array('l', [0]) * n_phrases
+        sum_freq = array('l', [0]) * n_phrases
+        sum_score = array('d', [0.0]) * n_phrases
+        for p, ids, _ in self._phrases():
+            # each word counts once, summed in id order
+            ids = sorted(set(ids))
+            sum_deg[p] = sum(degree[i] for i in ids)
+            sum_freq[p] = sum(freq[i] for i in ids)
+            sum_score[p] = sum(score[i] for i in ids)
+        return sum_deg, sum_freq, sum_score
+
+    def word_scores(self, tables=None):
+        """Word scores in first-seen order."""
+        degree, freq, score = tables or self.word_tables()
+        return [WordScore(word=word, deg=degree[i], freq=freq[i], score=score[i])
+                for i, word in enumerate(self.words) if freq[i]]
+
+    def _adjoining_rows(self):
+        # (keyword, first phrase id, second phrase id) of the adjoining
+        # keywords that recur
+        phrase_index = self.phrase_index
+        return [(' '.join(key), phrase_index[key[0]], phrase_index[key[2]])
+                for key, count in self.adjoining.items() if count >= _ADJOINING_MIN_COUNT]
+
+    def _with_adjoining(self, ids, rows, *columns):
+        # the keywords and `columns` with the adjoining `rows` appended after
+        # the phrases, each scored as the sum of its two keywords
+        n_phrases = len(self.keywords)
+        ids.extend(range(n_phrases, n_phrases + len(rows)))
+        keywords = self.keywords + [keyword for keyword, _, _ in rows]
+        return [keywords] + [list(column) + [column[p] + column[q] for _, p, q in rows]
+                             for column in columns]
+
+    def keyword_rows(self, tables=None, top_k=None, top_fraction=None, weight=None):
+        """The columns behind `keyword_scores`, without building namedtuples.
+
+        Returns the selected ids, in order, and the keyword, summed degree,
+        summed frequency and score sequences they index.
+        """
+        sum_deg, sum_freq, sum_score = self.phrase_tables(*(tables or self.word_tables()))
+        keywords = self.keywords
+        ids = [p for p, count in enumerate(self.phrase_counts) if count]
+        if self.adjoining:
+            keywords, sum_deg, sum_freq, sum_score = self._with_adjoining(
+                ids, self._adjoining_rows(), sum_deg, sum_freq, sum_score)
+        if weight is not None:
+            sum_score = list(sum_score)
+            for p in ids:
+                sum_score[p] *= weight(keywords[p])
+        return _select(ids, sum_score, top_k, top_fraction), keywords, sum_deg, sum_freq, sum_score
+
+    def keyword_scores(self, tables=None, top_k=None, top_fraction=None, weight=None):
+        """Keyword scores in descending order of score, see `_select`.
+
+        Adjoining keywords seen at least twice are included, after the
+        candidates they tie with. If given, `weight(keyword)` multiplies the
+        score of each keyword.
+        """
+        return _keyword_scores(*self.keyword_rows(tables, top_k, top_fraction, weight))
+
+    def clear(self):
+        """Forget every word and phrase, eg. once the rows of a table used only once are taken."""
+        self.__init__(self.backend)
+
+
+class _IncrementalScoreTable(_ScoreTable):
+    """`_ScoreTable` whose scores are kept up to date as candidates come and go.
+
+    Word degrees and frequencies are updated by every `add` and `remove`. A
+    query rescores only the phrases added since the last one and those
+    containing a word whose score changed, and sums degrees and frequencies
+    only for the keywords it returns: those sums change with every
+    occurrence of a common word, the rounded word scores rarely do. The
+    scores are also kept in a heap, so a `top_k` query does not look at
+    every phrase either. Repeated queries over a growing or sliding
+    collection so cost time in proportion to what changed in between rather
+    than to everything seen, with the same results as `_ScoreTable`. The
+    backend is not used, as there is no whole-table computation to
+    vectorise.
+    """
+
+    def __init__(self, backend=None):
+        _ScoreTable.__init__(self, backend)
+        self.degree = array('l')
+        self.freq = array('l')
+        self.score = array('d')
+        self.sum_score = array('d')
+        # ids of the phrases containing each word, in increasing order
+        self.word_phrases = []
+        # words whose degree or frequency changed, and phrases added, since
+        # the last `_refresh`
+        self.dirty_words = set()
+        self.dirty_phrases = set()
+        # weight function of the last query and its value for each phrase
+        self.weight = None
+        self.weights = array('d')
+        # (-weighted score, phrase id) of every counted phrase; entries left
+        # behind by rescoring or removal are skipped when popped, and the
+        # heap is rebuilt, when None, by `_refresh`
+        self.heap = None
+
+    def _intern_phrase(self, keyword, word_ids):
+        n_new = len(self.words) - len(self.degree)
+        if n_new:
+            self.degree.extend(array('l', [0]) * n_new)
+            self.freq.extend(array('l', [0]) * n_new)
+            self.score.extend(array('d', [0.0]) * n_new)
+            self.word_phrases.extend([] for _ in range(n_new))
+        p = _ScoreTable._intern_phrase(self, keyword, word_ids)
+        for i in set(word_ids):
+            self.word_phrases[i].append(p)
+        self.sum_score.append(0.0)
+        return p
+
+    def _word_ids(self, p):
+        # distinct word ids of phrase `p` in the order `phrase_tables` sums them
+        phrase_ends = self.phrase_ends
+        return sorted(set(self.phrase_words[phrase_ends[p - 1] if p else 0:phrase_ends[p]]))
+
+    def _count(self, phrase_ids, sign):
+        # fold `sign` occurrences of each phrase into the word tables
+        degree = self.degree
+        freq = self.freq
+        phrase_words = self.phrase_words
+        phrase_ends = self.phrase_ends
+        changed = set()
+        for p in phrase_ids:
+            ids = phrase_words[phrase_ends[p - 1] if p else 0:phrase_ends[p]]
+            phrase_degree = len(ids) * sign
+            for i in ids:
+                degree[i] += phrase_degree
+                freq[i] += sign
+            changed.update(ids)
+        self.dirty_words |= changed
+
+    def _recount(self):
+        # rebuild the word tables from the phrase counts and rescore everything
+        n_words = len(self.words)
+        self.degree = degree = array('l', [0]) * n_words
+        self.freq = freq = array('l', [0]) * n_words
+        for _, ids, count in self._phrases():
+            phrase_degree = len(ids) * count
+            for i in ids:
+                degree[i] += phrase_degree
+                freq[i] += count
+        self.dirty_words = set(range(n_words))
+        self.dirty_phrases = set(range(len(self.keywords)))
+        self.heap = None
+
+    def add(self, candidate_keywords):
+        phrase_ids = list(map(self.phrase_index.get, candidate_keywords))
+        _ScoreTable.add(self, candidate_keywords)
+        phrase_index = self.phrase_index
+        # interned by `add` if new
+        phrase_ids = [phrase_index[keyword] if p is None else p
+                      for keyword, p in zip(candidate_keywords, phrase_ids)]
+        self._count(phrase_ids, 1)
+        self.dirty_phrases.update(phrase_ids)
+
+    def remove(self, candidate_keywords):
+        _ScoreTable.remove(self, candidate_keywords)
+        self._count(map(self.phrase_index.__getitem__, candidate_keywords), -1)
+
+    def remove_ids(self, phrase_ids):
+        _ScoreTable.remove_ids(self, phrase_ids)
+        self._count(phrase_ids, -1)
+
+    def compact(self):
+        phrase_remap = _ScoreTable.compact(self)
+        self._recount()
+        return phrase_remap
+
+    def truncate(self, n_words, n_phrases):
+        word_phrases = self.word_phrases
+        # forgotten phrases are the last ones appended to their words' lists
+        for p in range(len(self.keywords) - 1, n_phrases - 1, -1):
+            for i in self._word_ids(p):
+                if i < n_words:
+                    word_phrases[i].pop()
+        _ScoreTable.truncate(self, n_words, n_phrases)
+        for column in (self.degree, self.freq, self.score, word_phrases):
+            del column[n_words:]
+        del self.sum_score[n_phrases:]
+        del self.weights[n_phrases:]
+        self.dirty_words = {i for i in self.dirty_words if i < n_words}
+        self.dirty_phrases = {p for p in self.dirty_phrases if p < n_phrases}
+
+    def merge(self, other):
+        _ScoreTable.merge(self, other)
+        self._recount()
+
+    def _weigh(self, weight):
+        # make `weight` the weight of the heap's scores
+        if weight != self.weight:
+            self.weight = weight
+            self.weights = array('d')
+            self.heap = None
+
+    def _refresh(self):
+        # rescore the changed words, then the counted phrases that are new or
+        # contain a word whose score changed
+        degree, freq, score = self.degree, self.freq, self.score
+        word_phrases = self.word_phrases
+        phrases = self.dirty_phrases
+        for i in self.dirty_words:
+            fr = freq[i]
+            word_score = round(degree[i] / fr, 2) if fr else 0.0
+            if word_score != score[i]:
+                score[i] = word_score
+                phrases.update(word_phrases[i])
+        self.dirty_words = set()
+        self.dirty_phrases = set()
+
+        phrase_counts = self.phrase_counts
+        sum_score = self.sum_score
+        phrase_words = self.phrase_words
+        phrase_ends = self.phrase_ends
+        phrases = [p for p in phrases if phrase_counts[p]]
+        for p in phrases:
+            ids = phrase_words[phrase_ends[p - 1] if p else 0:phrase_ends[p]]
+            if len(ids) > 1:
+                # as in `_word_ids`
+                ids = sorted(set(ids))
+            sum_score[p] = sum(map(score.__getitem__, ids))
+
+        weights = self.weights
+        if self.weight is not None:
+            weights.extend(map(self.weight, self.keywords[len(weights):]))
+        if self.weight is None:
+            entries = [(-sum_score[p], p) for p in phrases]
+        else:
+            entries = [(-sum_score[p] * weights[p], p) for p in phrases]
+        heap = self.heap
+        if heap is None or len(heap) + len(entries) > 2 * len(phrase_counts) + 1024:
+            # rebuilt, without stale entries, when they could outnumber the others
+            if self.weight is None:
+                heap = [(-sum_score[p], p) for p, count in enumerate(phrase_counts) if count]
+            else:
+                heap = [(-sum_score[p] * weights[p], p)
+                        for p, count in enumerate(phrase_counts) if count]
+            heapq.heapify(heap)
+            self.heap = heap
+        else:
+            for entry in entries:
+                heapq.heappush(heap, entry)
+
+    def _top(self, k):
+        # ids of the `k` counted phrases with the highest weighted scores,
+        # ties in id order, popping stale heap entries on the way
+        heap = self.heap
+        phrase_counts = self.phrase_counts
+        sum_score = self.sum_score
+        weights = self.weights if self.weight is not None else None
+        top = []
+        seen = set()
+        while heap and len(top) < k:
+            entry = heapq.heappop(heap)
+            key, p = entry
+            if p in seen or p >= len(phrase_counts) or not phrase_counts[p]:
+                continue
+            if key != (-sum_score[p] if weights is None else -sum_score[p] * weights[p]):
+                continue
+            seen.add(p)
+            top.append(entry)
+        for entry in top:
+            heapq.heappush(heap, entry)
+        return [p for _, p in top]
+
+    def word_tables(self):
+        self._refresh()
+        return self.degree, self.freq, self.score
+
+    def keyword_rows(self, tables=None, top_k=None, top_fraction=None, weight=None):
+        self._weigh(weight)
+        self._refresh()
+        keywords = self.keywords
+        n_phrases = len(keywords)
+        if top_k is not None and top_fraction is None:
+            # no phrase outside the best `top_k` can be selected
+            ids = sorted(self._top(top_k))
+        else:
+            ids = [p for p, count in enumerate(self.phrase_counts) if count]
+        sum_score = self.sum_score
+        rows = self._adjoining_rows() if self.adjoining else []
+        if rows:
+            keywords, sum_score = self._with_adjoining(ids, rows, sum_score)
+        if weight is not None:
+            weights = self.weights
+            sum_score = {p: sum_score[p] * (weights[p] if p < n_phrases else weight(keywords[p]))
+                         for p in ids}
+        selected = _select(ids, sum_score, top_k, top_fraction)
+
+        degree, freq = self.degree, self.freq
+        sum_deg, sum_freq = {}, {}
+        for p in selected:
+            parts = [p] if p < n_phrases else rows[p - n_phrases][1:]
+            sum_deg[p] = sum(sum(degree[i] for i in self._word_ids(q)) for q in parts)
+            sum_freq[p] = sum(sum(freq[i] for i in self._word_ids(q)) for q in parts)
+        return selected, keywords, sum_deg, sum_freq, sum_score
+
+
+def _keyword_scores(selected, keywords, sum_deg, sum_freq, sum_score):
+    # namedtuples of the rows returned by `_ScoreTable.keyword_rows`
+    return [KeywordScore(keyword=keywords[p], sum_deg=sum_deg[p],
+                         sum_freq=sum_freq[p], score=sum_score[p])
+            for p in selected]
+
+
+def _scan_tokens(tokens, phrase_builder, stopwords, phrase_delimiters):
+    """Split lowercase tokens into candidate keywords, skipping empty tokens.
+
+    Phrases end at stopwords and at tokens starting or ending with a phrase
+    delimiter. `phrase_builder` holds the words of the phrase still open after
+    the last token; it is updated in place so scanning can resume on the next
+    tokens.
+    """
+    keywords = []
+    append = keywords.append
+    add_word = phrase_builder.append
+
+    for word in tokens:
+        if not word:
+            continue
+        punct_suffix = word[-1] in phrase_delimiters
+        punct_prefix = word[0] in phrase_delimiters
+        if punct_suffix:
+            word = word[:-1]
+        elif punct_prefix:
+            word = word[1:]
+
+        if word in stopwords:
+            if phrase_builder:
+                append(' '.join(phrase_builder))
+                del phrase_builder[:]
+        elif punct_suffix or punct_prefix:
+            # a delimiter only closes a phrase that is already open
+            if phrase_builder:
+                add_word(word)
+                append(' '.join(phrase_builder).strip())
+                del phrase_builder[:]
+        else:
+            add_word(word)
+
+    return keywords
+
+
+def _scan_adjoining(tokens, phrase_builder, stopwords, phrase_delimiters, adjoining, link):
+    """`_scan_tokens`, also counting adjoining candidates into `adjoining`.
+
+    Two candidates adjoin when exactly one stopword token, without
+    punctuation, separates them, eg. "axis of evil"; `adjoining` counts each
+    (keyword, stopword, keyword). `link` holds the candidate and stopword the
+    next candidate would adjoin, if any, and is updated in place like
+    `phrase_builder`.
+    """
+    keywords = []
+    append = keywords.append
+    add_word = phrase_builder.append
+    count = adjoining.get
+
+    for word in tokens:
+        if not word:
+            continue
+        punct_suffix = word[-1] in phrase_delimiters
+        punct_prefix = word[0] in phrase_delimiters
+        if punct_suffix:
+            word = word[:-1]
+        elif punct_prefix:
+            word = word[1:]
+
+        if word in stopwords:
+            if phrase_builder:
+                keyword = ' '.join(phrase_builder)
+                append(keyword)
+                del phrase_builder[:]
+                if link:
+                    key = (link[0], link[1], keyword)
+                    adjoining[key] = count(key, 0) + 1
+                link[:] = () if punct_suffix or punct_prefix else (keyword, word)
+            else:
+                del link[:]
+        elif punct_suffix or punct_prefix:
+            if phrase_builder:
+                add_word(word)
+                keyword = ' '.join(phrase_builder).strip()
+                append(keyword)
+                del phrase_builder[:]
+                if link:
+                    key = (link[0], link[1], keyword)
+                    adjoining[key] = count(key, 0) + 1
+            del link[:]
+        else:
+            add_word(word)
+
+    return keywords
+
+
+def _tokenize(text, pipeline):
+    # lowercasing never creates or removes a word delimiter, so the whole text
+    # is lowercased at once, every delimiter is mapped to one separator and a
+    # single split gives the tokens, with empty strings between consecutive
+    # delimiters
+    return text.lower().translate(pipeline.delimiter_table).split(pipeline.separator)
+
+
+def _load_backend(name):
+    if name == 'python':
+        return None
+    if name == 'numpy':
+        try:
+            from ._numpy_backend import NumpyBackend
+        except ImportError:
+            # NumPy is optional; the pure Python backend gives the same scores
+            return None
+        return NumpyBackend()
+    raise ValueError('Backend {} not found'.format(name))
+
+
+def _limit(n, top_k=None, top_fraction=None):
+    """Number of keywords out of `n` to keep for `top_k`/`top_fraction`, or None for all."""
+    if top_fraction is not None:
+        if not 0 <= top_fraction <= 1:
+            raise ValueError('top_fraction must be between 0 and 1, got {}'.format(top_fraction))
+        k = int(n * top_fraction)
+        top_k = k if top_k is None else min(top_k, k)
+    if top_k is not None and top_k < 0:
+        raise ValueError('top_k must be non-negative, got {}'.format(top_k))
+    return top_k
+
+
+def _select(ids, scores, top_k=None, top_fraction=None):
+    """The `ids` with the highest `scores`, in descending order of score.
+
+    Ties keep the order of `ids`. Only selecting every id needs a full sort;
+    otherwise a heap keeps the best `top_k`.
+    """
+    top_k = _limit(len(ids), top_k, top_fraction)
+    if top_k is None or top_k >= len(ids):
+        return sorted(ids, key=scores.__getitem__, reverse=True)
+    return heapq.nlargest(top_k, ids, key=scores.__getitem__)
+
+
+def _check_document(text):
+    # anything else would be scanned as the characters of some other string
+    if isinstance(text, str):
+        return
+    if not isinstance(text, list):
+        raise TypeError('Documents must be strings or lists of tokens, got {}'.format(
+            type(text).__name__))
+    for token in text:
+        if not isinstance(token, str):
+            raise TypeError('Tokens must be strings, got {}'.format(type(token).__name__))
+
+
+def _iter_chunks(stream, chunk_size):
+    read = getattr(stream, 'read', None)
+    if read is None:
+        for chunk in stream:
+            yield chunk
+        return
+    while True:
+        chunk = read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+class _CandidateStream(object):
+    """Candidate keywords of a text that arrives in chunks.
+
+    A token cut by a chunk boundary is carried over to the next chunk and the
+    open phrase is kept between chunks, so the candidates are the same as for
+    the whole text at once. Chunks can also be lists of tokens, which are
+    never cut.
+
+    Every path from text to candidates goes through here. If `table` is
+    given, each chunk's candidates are added to it as soon as they are
+    scanned, and `record`, if given, receives the tokenize and candidates
+    stages of `RakeStats`, summed over the chunks, when the stream is closed.
+    """
+
+    def __init__(self, pipeline, table=None, adjoining=None, stopwords=None, record=None):
+        self.pipeline = pipeline
+        self.table = table
+        self.stopwords = pipeline.stopwords if stopwords is None else stopwords
+        # pieces of the token cut by the last chunk boundary, joined only once
+        # a later chunk ends it, so long tokens are not copied for every chunk
+        self.partial = []
+        self.phrase_builder = []
+        # adjoining counter and its carried link, see `_scan_adjoining`
+        self.adjoining = adjoining
+        self.link = []
+        self.record = record
+        # seconds and counts of the tokenize and candidates stages so far
+        self.times = [0.0, 0, 0.0, 0]
+
+    def _scan(self, text):
+        record = self.record
+        if record is not None:
+            t0 = time.perf_counter()
+        if isinstance(text, list):
+            tokens = [token.lower() for token in text]
+        else:
+            tokens = _tokenize(text, self.pipeline)
+        if record is not None:
+            t1 = time.perf_counter()
+
+        if self.adjoining is not None:
+            candidates = _scan_adjoining(tokens, self.phrase_builder, self.stopwords,
+                                         self.pipeline.phrase_delimiters, self.adjoining, self.link)
+        else:
+            candidates = _scan_tokens(tokens, self.phrase_builder, self.stopwords,
+                                      self.pipeline.phrase_delimiters)
+        if self.table is not None:
+            self.table.add(candidates)
+
+        if record is not None:
+            times = self.times
+            times[0] += t1 - t0
+            times[1] += len(tokens) - tokens.count('')
+            times[2] += time.perf_counter() - t1
+            times[3] += len(candidates)
+        return candidates
+
+    def feed(self, chunk):
+        if isinstance(chunk, list):
+            return self._scan(chunk)
+        # the text after the last delimiter may continue in the next chunk
+        cut = max(chunk.rfind(i) for i in self.pipeline.word_delimiters) + 1
+        if not cut:
+            if chunk:
+                self.partial.append(chunk)
+            return []
+        self.partial.append(chunk[:cut])
+        text = ''.join(self.partial)
+        self.partial = [chunk[cut:]] if cut < len(chunk) else []
+        return self._scan(text)
+
+    def pending(self, adjoining=None):
+        """Candidates `close` would return now, leaving the stream open.
+
+        The adjoining candidates they would complete are counted into
+        `adjoining`, if given.
+        """
+        tokens = _tokenize(''.join(self.partial), self.pipeline)
+        if adjoining is not None:
+            return _scan_adjoining(tokens, list(self.phrase_builder), self.stopwords,
+                                   self.pipeline.phrase_delimiters, adjoining, list(self.link))
+        return _scan_tokens(tokens, list(self.phrase_builder), self.stopwords,
+                            self.pipeline.phrase_delimiters)
+
+    def close(self, chunk=''):
+        """Candidates completed by the last `chunk`; the open phrase is dropped, as in `Rake.run`."""
+        text = chunk if isinstance(chunk, list) else ''.join(self.partial) + chunk
+        self.partial = []
+        candidates = self._scan(text)
+        if self.record is not None:
+            tokenize_seconds, n_tokens, candidates_seconds, n_candidates = self.times
+            self.record('tokenize', tokenize_seconds, n_tokens)
+            self.record('candidates', candidates_seconds, n_candidates)
+        return candidates
+
 
 class Rake(object):
     """Extract keywords from a document using the Rapid Automtic Keyword Exraction (RAKE) algorithm.
@@ -23,6 +863,25 @@ class Rake(object):
     stop_words_source : string {'fox', 'smart'}, default='fox'
             If 'fox' uses , Fox’s stop word list (Fox 1989). len=425
             If 'smart' uses stop word list from SMART (Salton 1971). len=571
+            Lists added with `rake.stoplists.register_stopwords` can be used
+            by name too
+    backend : string {'python', 'numpy'}, default='python'
+            Implementation of word and phrase scoring. 'numpy' vectorises
+            scoring over whole documents, which pays off on long documents
+            and corpora; it falls back to 'python' if NumPy is not installed
+    stats : RakeStats or None, default=None
+            If given, the wall time and counts of each stage of every run are
+            recorded in it; see `RakeStats`
+    adjoining : bool, default=False
+            If True, the `run` methods also return adjoining keywords: two
+            candidates joined by one stopword, eg. "axis of evil", that appear
+            so at least twice in a document. Their scores are the sums of the
+            scores of the two candidates
+    idf : rake.idf.IdfIndex or None, default=None
+            If given, every keyword score is multiplied by the inverse
+            document frequency of the keyword in the index's corpus.
+            Adjoining keywords are only counted by indexes built with
+            `adjoining` set; other indexes give them the highest weight
 
     Attributes
     ----------
@@ -34,139 +893,225 @@ class Rake(object):
             must call `run` first
     """
 
-    def __init__(self, stop_words_source='fox'):
+    def __init__(self, stop_words_source='fox', backend='python', stats=None, adjoining=False,
+                 idf=None):
         self.stop_words_source = stop_words_source
-        self.phrase_delimiters = [i for i in punctuation]
-        self.word_delimiters = [i for i in whitespace]
+        self.backend = backend
+        self.stats = stats
+        self.adjoining = adjoining
+        self.idf = idf
+        self.phrase_delimiters = list(_PUNCTUATION)
+        self.word_delimiters = list(_WHITESPACE)
         self.word_scores = "Call `run` to calculate word scores"
         self.keyword_scores = "Call `run` to calculate keyword scores"
+        self._pipeline = self._compile_pipeline()
+        self._backend = _load_backend(backend)
+
+    @property
+    def _weight(self):
+        # multiplier of each keyword's score, if any
+        return self.idf.idf if self.idf is not None else None
 
     def _load_stopword_list(self, source='fox'):
-        source = source.lower().strip()
-        if source == 'smart':
-            from .SmartStoplist import stopwords
-        elif source == 'fox':
-            from .FoxStoplist import stopwords
-        else:
-            raise ValueError('Stopword source {} not found'.format(source))
-        return stopwords
+        return get_stopwords(source)
 
-    def _generate_candidate_keywords(self, text, stopwords):
-        keywords = []
-        phrase_builder = []
-        if isinstance(text, list):
-            word_array = text
-        elif isinstance(text, str):
-            word_array = re.split(r'|'.join(self.word_delimiters), text)
-        else:
-            return "Not tokenized list or text"
+    def _compile_pipeline(self):
+        # both parts are built once per process and shared between instances
+        stopwords = self._load_stopword_list(source=self.stop_words_source)
+        return _Pipeline(stopwords,
+                         *_compile_delimiters(self.phrase_delimiters, self.word_delimiters))
 
-        # newlines are split into tokens
-        word_array = [word for word in word_array if word]
+    def _candidate_stream(self, table):
+        # candidates of one document into `table`, timed if `stats` is set
+        return _CandidateStream(self._pipeline, table, table.adjoining if self.adjoining else None,
+                                record=self.stats.record if self.stats is not None else None)
 
-        for token in word_array:
-            word = token.lower()
+    def _generate_candidate_keywords(self, text, stopwords=None, adjoining=None):
+        # checked up front, as callers pass tables that a failed scan would leave half updated
+        _check_document(text)
+        return _CandidateStream(self._pipeline, adjoining=adjoining, stopwords=stopwords).close(text)
 
-            # newlines appear as tokens
-            # if not token:
-            #    continue
+    def _table(self, text):
+        _check_document(text)
+        table = _ScoreTable(self._backend)
+        # long documents are scanned a slice at a time, so the lowercased
+        # copy, the tokens and the candidates of only one slice are alive at
+        # once and memory use follows the vocabulary, not the length
+        candidates = self._candidate_stream(table)
+        last = max(0, (len(text) - 1) // _SCAN_SIZE * _SCAN_SIZE)
+        for i in range(0, last, _SCAN_SIZE):
+            candidates.feed(text[i:i + _SCAN_SIZE])
+        candidates.close(text[last:] if last else text)
+        return table
 
-            punct_suffix = word[-1] in self.phrase_delimiters
-            punct_prefix = word[0] in self.phrase_delimiters
-            punct_flag = punct_suffix or punct_prefix
-            nonempty_flag = phrase_builder != []
+    def _scores(self, table, top_k=None, top_fraction=None, word_scores=True, batch=None):
+        # `batch`, if given, receives the keywords instead of namedtuples
+        stats = self.stats
+        if stats is not None:
+            t0 = time.perf_counter()
+        tables = table.word_tables()
+        if word_scores:
+            word_scores = table.word_scores(tables)
+        if stats is not None:
+            t1 = time.perf_counter()
+            stats.record('word_scores', t1 - t0, len(table.words))
+        n_phrases = len(table.keywords)
+        rows = table.keyword_rows(tables, top_k, top_fraction, self._weight)
+        # `table` is not used again; its indexes go before the results are built,
+        # which leaves the keyword strings and the rows as the only tables alive
+        table.clear()
+        del tables
+        if batch is not None:
+            keywords = batch._append_rows(*rows)
+        else:
+            keywords = _keyword_scores(*rows)
+        if stats is not None:
+            stats.record('phrase_scores', time.perf_counter() - t1, n_phrases)
+        return word_scores, keywords
 
-            if punct_suffix:
-                word = word[:-1]
-            elif punct_prefix:
-                word = word[1:]
+    def run(self, text, top_k=None, top_fraction=None):
+        """Runs the RAKE algorithm on `text`
 
-            stopword_flag = word in stopwords
+        Memory use follows the number of distinct candidate phrases rather
+        than the length of `text`. Returning every keyword costs about as
+        much again as the score tables, for the namedtuples; `top_k`,
+        `top_fraction` or `run_batch` avoid most of that.
 
-            #print(token, punct_flag, stopword_flag, nonempty_flag)
+        Parameters
+        ----------
+        text : string or list of strings
+                A string object containing the text for keyword extraction, or
+                its tokens. Anything else raises TypeError
+        top_k : int or None, default=None
+                If given, only the `top_k` highest scoring keywords are returned
+        top_fraction : float or None, default=None
+                If given, only this fraction of the keywords is returned, eg.
+                1/3 for the top third used in the paper. Combined with `top_k`,
+                the smaller of the two limits applies
 
-            if not stopword_flag and not punct_flag:
-                phrase_builder.append(word)
-            elif stopword_flag and nonempty_flag:
-                phrase = ' '.join(phrase_builder)
-                keywords.append(phrase)
-                phrase_builder = []
-            elif punct_flag and nonempty_flag and not stopword_flag:
-                phrase_builder.append(word)
-                phrase = ' '.join(phrase_builder)
-                keywords.append(phrase.strip())
-                phrase_builder = []
+        Returns
+        -------
+        sorted_keywords : list of namedtuples, len=n_keywords
+                Ties are ordered by first appearance in `text`
+        """
+        word_scores, keywords = self._scores(self._table(text), top_k, top_fraction)
+        self.word_scores = word_scores
+        self.keyword_scores = keywords
 
         return keywords
 
-    def _calculate_word_scores(self, candidate_keywords):
-        freq_counter = Counter()
-        degree_counter = defaultdict(int)
+    def run_stream(self, stream, chunk_size=1 << 16, top_k=None, top_fraction=None):
+        """Runs the RAKE algorithm on text read incrementally from `stream`
 
-        for keyword in candidate_keywords:
-            word_list = keyword.split()
-            degree = len(word_list)
-            freq_counter += Counter(word_list)
-            for word in word_list:
-                degree_counter[word] += degree
+        Only the open phrase, the last partial token and the degree/frequency
+        tables are kept in memory, so memory use depends on the vocabulary
+        rather than on the length of the text. Results are the same as for
+        `run` on the whole text.
+
+        Parameters
+        ----------
+        stream : text file object or iterable of strings
+                Text for keyword extraction, read in chunks of `chunk_size`
+                characters if it has a `read` method, else consumed chunk by chunk
+        chunk_size : int, default=65536
+                Number of characters per read from a file object
+        top_k, top_fraction : see `run`
+
+        Returns
+        -------
+        sorted_keywords : list of namedtuples, len=n_keywords
+        """
+        table = _ScoreTable(self._backend)
+        candidates = self._candidate_stream(table)
+        for chunk in _iter_chunks(stream, chunk_size):
+            candidates.feed(chunk)
+        candidates.close()
 
-        score = {word: round(
-            degree_counter[word] / freq_counter[word], 2) for word in degree_counter.keys()}
+        word_scores, keywords = self._scores(table, top_k, top_fraction)
+        self.word_scores = word_scores
+        self.keyword_scores = keywords
 
-        word_scores = []
-        for word in score.keys():
-            word_tuple = WordScore(word=word,
-                                   deg=degree_counter[word],
-                                   freq=freq_counter[word],
-                                   score=score[word])
-            word_scores.append(word_tuple)
+        return keywords
 
-        sorted_word_scores = sorted(
-            word_scores, key=lambda x: x.score, reverse=True)
+    def run_file(self, path, encoding='utf-8', chunk_size=1 << 20, top_k=None, top_fraction=None):
+        """Runs the RAKE algorithm on the text file at `path`
 
-        self.word_scores = sorted_word_scores
+        The file is memory-mapped and decoded `chunk_size` bytes at a time, so
+        the decoded document is never held in memory as a whole. Results are
+        the same as for `run(open(path).read())`.
 
-        return word_scores
+        Parameters
+        ----------
+        path : string
+                Path of the file containing the text for keyword extraction
+        encoding : string, default='utf-8'
+                Encoding of the file
+        chunk_size : int, default=1048576
+                Number of bytes decoded and scanned at a time
+        top_k, top_fraction : see `run`
 
-    def _calculate_phrase_scores(self, candidate_keywords, word_scores):
-        keyword_scores = []
+        Returns
+        -------
+        sorted_keywords : list of namedtuples, len=n_keywords
+        """
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if not size:
+                # empty files cannot be mapped
+                return self.run_stream([], top_k=top_k, top_fraction=top_fraction)
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                decoder = codecs.getincrementaldecoder(encoding)()
+                chunks = (decoder.decode(mapped[i:i + chunk_size], final=i + chunk_size >= size)
+                          for i in range(0, size, chunk_size))
+                return self.run_stream(chunks, top_k=top_k, top_fraction=top_fraction)
 
-        candidate_keywords = list(set(candidate_keywords))
+    def run_many(self, docs, top_k=None, top_fraction=None):
+        """Runs the RAKE algorithm on every document in `docs`
 
-        for keyword in candidate_keywords:
-            word_list = keyword.split()
-            words = [
-                WordScore for WordScore in word_scores if WordScore.word in word_list]
-            keyword_tuple = KeywordScore(keyword=keyword, sum_deg=sum(i.deg for i in words),
-                                         sum_freq=sum(i.freq for i in words),
-                                         score=sum(i.score for i in words))
-            keyword_scores.append(keyword_tuple)
+        Unlike `run`, this does not store results on `word_scores` or
+        `keyword_scores`, so memory use does not grow with the corpus.
+
+        Parameters
+        ----------
+        docs : iterable of strings or tokenized lists
+                Documents for keyword extraction, consumed lazily. Documents
+                of any other type raise TypeError
+        top_k, top_fraction : see `run`, applied to each document
 
-        sorted_keywords = sorted(
-            keyword_scores, key=lambda x: x.score, reverse=True)
+        Yields
+        ------
+        sorted_keywords : list of namedtuples, one list per document
+        """
+        make_table = self._table
+        scores = self._scores
+        for text in docs:
+            # word scores are never built as namedtuples here
+            yield scores(make_table(text), top_k, top_fraction, word_scores=False)[1]
 
-        return sorted_keywords
+    def run_batch(self, docs, top_k=None, top_fraction=None):
+        """Runs the RAKE algorithm on every document in `docs`, into columnar arrays
 
-    def run(self, text):
-        """Runs the RAKE algorithm on `text`
+        Results go straight from the score tables into a `KeywordBatch`,
+        without building a namedtuple per keyword, and can be written to a
+        binary file with `KeywordBatch.write`.
 
         Parameters
         ----------
-        text : string
-                A string object containing the text for keyword extraction
+        docs : iterable of strings or tokenized lists
+                Documents for keyword extraction, consumed lazily. Documents
+                of any other type raise TypeError
+        top_k, top_fraction : see `run`, applied to each document
 
         Returns
         -------
-        sorted_keywords : list of namedtuples, len=n_keywords
+        batch : rake.columnar.KeywordBatch
+                One entry per document, in order
         """
-        stopwords = self._load_stopword_list(source=self.stop_words_source)
-        candidate_keywords = self._generate_candidate_keywords(text, stopwords)
+        from .columnar import KeywordBatch
 
-        word_scores = self._calculate_word_scores(candidate_keywords)
-        self.word_scores = word_scores
-
-        keywords = self._calculate_phrase_scores(
-            candidate_keywords, word_scores)
-        self.keyword_scores = keywords
-
-        return keywords
+        batch = KeywordBatch()
+        make_table = self._table
+        scores = self._scores
+        for text in docs:
+            scores(make_table(text), top_k, top_fraction, word_scores=False, batch=batch)
+        return batch
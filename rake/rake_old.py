@@ -22,22 +22,38 @@ def is_number(s):
         return False
 
 
+_WORD_SPLITTER = re.compile('[^a-zA-Z0-9_\\+\\-/]')
+
+# `is_number` for the words left by `_WORD_SPLITTER`: they cannot contain a
+# '.', so only `int()` syntax can succeed
+_INTEGER = re.compile('[+-]?[0-9]+(?:_[0-9]+)*\\Z')
+
+
 def separate_words(text, min_word_return_size):
     """
     Utility function to return a list of all words that are have a length greater than a specified number of characters.
     @param text The text that must be split in to words.
     @param min_word_return_size The minimum no of characters a word must have to be included.
     """
-    splitter = re.compile('[^a-zA-Z0-9_\\+\\-/]')
+    is_integer = _INTEGER.match
     words = []
-    for single_word in splitter.split(text):
+    for single_word in _WORD_SPLITTER.split(text):
         current_word = single_word.strip().lower()
         # leave numbers in phrase, but don't count as words, since they tend to invalidate scores of their phrases
-        if len(current_word) > min_word_return_size and current_word != '' and not is_number(current_word):
+        if len(current_word) > min_word_return_size and current_word != '' and not is_integer(current_word):
             words.append(current_word)
     return words
 
 
+def _split_phrases(phrase_list):
+    """Words of each distinct phrase of `phrase_list`, each split only once."""
+    phrase_words = {}
+    for phrase in phrase_list:
+        if phrase not in phrase_words:
+            phrase_words[phrase] = separate_words(phrase, 0)
+    return phrase_words
+
+
 def split_sentences(text):
     """
     Utility function to return a list of sentences.
@@ -69,10 +85,86 @@ def build_stop_word_regex(stopwords):
     return stop_word_pattern
 
 
+# Non-ASCII characters that IGNORECASE matching treats as equal to an ASCII
+# letter although their lowercase form is not that letter.
+_IGNORECASE_FOLDS = {0x130: 'i', 0x131: 'i', 0x17f: 's'}
+
+# Words that StopWordMatcher can match; a pattern from `build_stop_word_regex`
+# is needed for anything else.
+_MATCHER_WORD = re.compile(r"\w+(?:'\w+)*\Z")
+
+_WORD_RUN = re.compile(r'(\w+)')
+
+
+class StopWordMatcher(object):
+    """Hash-based equivalent of the pattern returned by `build_stop_word_regex`.
+
+    Instead of trying hundreds of regex alternatives at every position, each
+    run of word characters (optionally joined to the next ones by apostrophes)
+    is looked up in a dict of stopwords. It matches exactly where the regex
+    would, including the lookahead for hyphens and the preference for the
+    stopword listed first, but only supports stopwords made of word
+    characters and apostrophes; see `build_stop_word_matcher`.
+    """
+
+    def __init__(self, stopwords):
+        self.ranks = {}
+        for rank, word in enumerate(stopwords):
+            self.ranks.setdefault(word.lower(), rank)
+        self.max_parts = 1 + max([word.count("'") for word in self.ranks] or [0])
+
+    def sub(self, repl, string):
+        """Replace every stopword in `string` with `repl`, like `pattern.sub`."""
+        ranks = self.ranks
+        # words at odd indices, separators at even indices
+        parts = _WORD_RUN.split(string)
+        folded = [part if part.isascii() else part.translate(_IGNORECASE_FOLDS)
+                  for part in parts[1::2]]
+        folded = [part.lower() for part in folded]
+        n_words = len(folded)
+
+        i = 0
+        while i < n_words:
+            best_rank = None
+            word = folded[i]
+            for n in range(self.max_parts):
+                if n:
+                    # extend over an apostrophe joining the next word
+                    if i + n >= n_words or parts[2 * (i + n)] != "'":
+                        break
+                    word = word + "'" + folded[i + n]
+                rank = ranks.get(word)
+                if rank is not None and not parts[2 * (i + n) + 2].startswith('-'):
+                    if best_rank is None or rank < best_rank:
+                        best_rank, length = rank, n + 1
+            if best_rank is None:
+                i += 1
+                continue
+            parts[2 * i + 1] = repl
+            for j in range(2 * i + 2, 2 * (i + length)):
+                parts[j] = ''
+            i += length
+        return ''.join(parts)
+
+
+def build_stop_word_matcher(stopwords):
+    """Fast stopword matcher with the same matches as `build_stop_word_regex(stopwords)`.
+
+    Returns a `StopWordMatcher`, or the regex itself if some stopword
+    contains characters other than word characters and apostrophes.
+    """
+    if all(_MATCHER_WORD.match(word) for word in stopwords):
+        return StopWordMatcher(stopwords)
+    return build_stop_word_regex(stopwords)
+
+
 def generate_candidate_keywords(sentence_list, stopword_pattern):
     phrase_list = []
     for s in sentence_list:
-        tmp = re.sub(stopword_pattern, '|', s.strip())
+        if isinstance(stopword_pattern, StopWordMatcher):
+            tmp = stopword_pattern.sub('|', s.strip())
+        else:
+            tmp = re.sub(stopword_pattern, '|', s.strip())
         phrases = tmp.split("|")
         for phrase in phrases:
             phrase = phrase.strip().lower()
@@ -81,11 +173,13 @@ def generate_candidate_keywords(sentence_list, stopword_pattern):
     return phrase_list
 
 
-def calculate_word_scores(phraseList):
+def calculate_word_scores(phraseList, phrase_words=None):
+    if phrase_words is None:
+        phrase_words = _split_phrases(phraseList)
     word_frequency = defaultdict(int) #edited
     word_degree = defaultdict(int) #edited
     for phrase in phraseList:
-        word_list = separate_words(phrase, 0)
+        word_list = phrase_words[phrase]
         word_list_length = len(word_list)
         word_list_degree = word_list_length - 1
         # if word_list_degree > 3: word_list_degree = 3 #exp.
@@ -107,10 +201,12 @@ def calculate_word_scores(phraseList):
     return word_score
 
 
-def generate_candidate_keyword_scores(phrase_list, word_score):
+def generate_candidate_keyword_scores(phrase_list, word_score, phrase_words=None):
+    if phrase_words is None:
+        phrase_words = _split_phrases(phrase_list)
     keyword_candidates = defaultdict(int)
     for phrase in phrase_list:
-        word_list = separate_words(phrase, 0)
+        word_list = phrase_words[phrase]
         candidate_score = 0
         for word in word_list:
             candidate_score += word_score[word]
@@ -129,7 +225,7 @@ class Rake(object):
     """
     def __init__(self, stop_words_source='fox'):
         self.stop_words_source = stop_words_source
-        self.__stop_words_pattern = build_stop_word_regex(load_stopword_list(stop_words_source))
+        self.__stop_words_pattern = build_stop_word_matcher(load_stopword_list(stop_words_source))
 
     def run(self, text):
         """Runs the RAKE algorithm on `text`
@@ -145,7 +241,9 @@ class Rake(object):
         """
         sentence_list = split_sentences(text)
         phrase_list = generate_candidate_keywords(sentence_list, self.__stop_words_pattern)
-        word_scores = calculate_word_scores(phrase_list)
-        keyword_candidates = generate_candidate_keyword_scores(phrase_list, word_scores)
+        # split each distinct phrase once for both scoring stages
+        phrase_words = _split_phrases(phrase_list)
+        word_scores = calculate_word_scores(phrase_list, phrase_words)
+        keyword_candidates = generate_candidate_keyword_scores(phrase_list, word_scores, phrase_words)
         sorted_keywords = sorted(keyword_candidates.items(), key=operator.itemgetter(1), reverse=True)
         return sorted_keywords
@@ -0,0 +1,94 @@
+"""
+Registry of stopword lists, by name.
+
+Each list is read and frozen into a set the first time it is used, and that
+set is then shared by every `Rake` using the list, so constructing an
+extractor does no work per stopword. The built-in 'fox' and 'smart' lists
+are only imported if they are used.
+"""
+
+# `threading` would add a few milliseconds to `import rake`
+from _thread import allocate_lock
+
+# name: loader returning an iterable of stopwords
+_loaders = {}
+# name: frozenset built by the loader
+_stopwords = {}
+_lock = allocate_lock()
+
+
+def _load_fox():
+    from .FoxStoplist import stopwords
+    return stopwords
+
+
+def _load_smart():
+    from .SmartStoplist import stopwords
+    return stopwords
+
+
+def _read_file(path, encoding):
+    def load():
+        with open(path, encoding=encoding) as f:
+            return [word for word in (line.strip().lower() for line in f)
+                    if word and not word.startswith('#')]
+    return load
+
+
+def _normalize(name):
+    return name.lower().strip()
+
+
+def register_stopwords(name, path=None, words=None, encoding='utf-8'):
+    """Register a stopword list under `name`, replacing any list of that name.
+
+    Parameters
+    ----------
+    name : string
+            Name to pass as `Rake(stop_words_source=name)`; case-insensitive
+    path : string or None, default=None
+            File with one stopword per line. Blank lines and lines starting
+            with '#' are skipped. The file is read on first use
+    words : iterable of strings or None, default=None
+            Stopwords, if not read from `path`
+    encoding : string, default='utf-8'
+            Encoding of the file at `path`
+    """
+    if (path is None) == (words is None):
+        raise ValueError('Exactly one of path and words must be given')
+    if path is not None:
+        loader = _read_file(path, encoding)
+    else:
+        words = [word.lower() for word in words]
+
+        def loader():
+            return words
+    name = _normalize(name)
+    with _lock:
+        _loaders[name] = loader
+        _stopwords.pop(name, None)
+
+
+def stopword_sources():
+    """Names of the registered stopword lists, sorted."""
+    return sorted(_loaders)
+
+
+def get_stopwords(name):
+    """The stopword list registered as `name`, as a frozenset shared by all callers."""
+    name = _normalize(name)
+    stopwords = _stopwords.get(name)
+    if stopwords is None:
+        with _lock:
+            try:
+                loader = _loaders[name]
+            except KeyError:
+                raise ValueError('Stopword source {} not found'.format(name))
+            stopwords = _stopwords.get(name)
+            if stopwords is None:
+                stopwords = _stopwords[name] = frozenset(loader())
+    return stopwords
+
+
+_loaders['fox'] = _load_fox
+_loaders['smart'] = _load_smart
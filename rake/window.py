@@ -0,0 +1,145 @@
+"""
+Sliding-window RAKE for streams: keywords of the last N documents or of the
+last few minutes.
+
+Each document's candidate phrases are added to shared degree/frequency
+tables and subtracted again when the document leaves the window, so adding
+or expiring a document costs time proportional to its own size, and a query
+only rescores the phrases whose words changed since the previous one.
+"""
+
+import time
+from array import array
+from collections import deque
+
+from .rake import Rake, _IncrementalScoreTable
+
+
+class WindowedRake(object):
+    """Keywords of the documents in a sliding window.
+
+    Scores equal those of `CorpusRake` over the documents currently in the
+    window up to floating-point rounding, and so up to the order of tied
+    keywords: a keyword's word scores are summed in the order the window
+    first saw its words, which expired documents can make differ from
+    their order in the current documents alone.
+
+    Parameters
+    ----------
+    rake : Rake or None, default=None
+            Extractor used to generate candidate keywords for each document,
+            and adjoining keywords if it has `adjoining` set. If None, uses
+            `Rake()`
+    max_documents : int or None, default=None
+            If given, only the most recent `max_documents` documents are kept
+    max_age : float or None, default=None
+            If given, documents older than `max_age` seconds are expired
+    clock : callable, default=time.time
+            Returns the current time in seconds, used when `add` and `expire`
+            are not given a timestamp
+
+    Attributes
+    ----------
+    n_documents : int
+            Number of documents currently in the window
+    """
+
+    def __init__(self, rake=None, max_documents=None, max_age=None, clock=time.time):
+        self.rake = rake if rake is not None else Rake()
+        self.max_documents = max_documents
+        self.max_age = max_age
+        self.clock = clock
+        self._table = _IncrementalScoreTable()
+        # (timestamp, phrase ids of its candidates, its adjoining counts or
+        # None) of each document, oldest first
+        self._documents = deque()
+        # number of candidates in the window, an upper bound on live phrases
+        self._size = 0
+
+    @property
+    def n_documents(self):
+        return len(self._documents)
+
+    def add(self, text, timestamp=None):
+        """Add a document (string or tokenized list) to the window, then expire old ones.
+
+        Any other document raises TypeError and leaves the window unchanged.
+        """
+        if timestamp is None:
+            timestamp = self.clock()
+        table = self._table
+        adjoining = {} if self.rake.adjoining else None
+        candidates = self.rake._generate_candidate_keywords(text, adjoining=adjoining)
+        table.add(candidates)
+        if adjoining:
+            table.count_adjoining(adjoining)
+        self._documents.append(
+            (timestamp, array('l', map(table.phrase_index.__getitem__, candidates)), adjoining))
+        self._size += len(candidates)
+        self.expire(timestamp)
+        return self
+
+    def expire(self, now=None):
+        """Remove the documents that fell out of the window.
+
+        Returns
+        -------
+        n_expired : int
+        """
+        documents = self._documents
+        expired = 0
+        if self.max_documents is not None:
+            while len(documents) > self.max_documents:
+                self._pop()
+                expired += 1
+        if self.max_age is not None:
+            if now is None:
+                now = self.clock()
+            while documents and documents[0][0] < now - self.max_age:
+                self._pop()
+                expired += 1
+        if expired:
+            self._compact()
+        return expired
+
+    def _pop(self):
+        _, phrase_ids, adjoining = self._documents.popleft()
+        self._table.remove_ids(phrase_ids)
+        if adjoining:
+            self._table.count_adjoining(adjoining, -1)
+        self._size -= len(phrase_ids)
+
+    def _compact(self):
+        # expired phrases keep their slot in the table until they clearly
+        # outnumber the live ones, which keeps the amortised cost of expiry
+        # linear in the size of the expired documents
+        table = self._table
+        if len(table.keywords) <= 2 * self._size + 1024:
+            return
+        remap = table.compact()
+        for _, phrase_ids, _ in self._documents:
+            for j, p in enumerate(phrase_ids):
+                phrase_ids[j] = remap[p]
+
+    def keyword_scores(self, top_k=None, top_fraction=None):
+        """Keyword scores over the current window, weighted by the `idf` index of `rake`, if any
+
+        Parameters
+        ----------
+        top_k, top_fraction : see `Rake.run`
+
+        Returns
+        -------
+        sorted_keywords : list of namedtuples, len=n_keywords
+        """
+        return self._table.keyword_scores(top_k=top_k, top_fraction=top_fraction,
+                                          weight=self.rake._weight)
+
+    def word_scores(self):
+        """Word scores over the current window, in descending order of score
+
+        Returns
+        -------
+        sorted_word_scores : list of namedtuples, len=n_words
+        """
+        return sorted(self._table.word_scores(), key=lambda x: x.score, reverse=True)
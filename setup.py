@@ -11,17 +11,20 @@ setup(
     author_email='TODO',  # TODO
     url='https://github.com/pmbaumgartner/rake',
     download_url='https://github.com/pmbaumgartner/rake/tarball/{}'.format(VERSION),
+    python_requires='>=3.8',
     install_requires=[],
+    extras_require={'numpy': ['numpy']},
+    entry_points={'console_scripts': ['rake = rake.cli:main']},
     license='MIT',
     classifiers=[
         'Development Status :: 4 - Beta',
         'License :: OSI Approved :: MIT License',
-        'Programming Language :: Python :: 2',
-        'Programming Language :: Python :: 2.6',
-        'Programming Language :: Python :: 2.7',
         'Programming Language :: Python :: 3',
-        'Programming Language :: Python :: 3.3',
-        'Programming Language :: Python :: 3.4',
-        'Programming Language :: Python :: 3.5',
+        'Programming Language :: Python :: 3 :: Only',
+        'Programming Language :: Python :: 3.8',
+        'Programming Language :: Python :: 3.9',
+        'Programming Language :: Python :: 3.10',
+        'Programming Language :: Python :: 3.11',
+        'Programming Language :: Python :: 3.12',
     ],
 )
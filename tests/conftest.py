@@ -0,0 +1,29 @@
+import pytest
+
+
+# abstracts sharing keywords across documents; the last one is pre-tokenized
+DOCS = [
+    "Compatibility of systems of linear constraints over the set of natural numbers.",
+    "Criteria of compatibility of a system of linear Diophantine equations, strict inequations.",
+    "Upper bounds for components of a minimal set of solutions are given.",
+    "Linear constraints, linear constraints and the corresponding algorithms for constructing a minimal set, here.",
+    ['minimal', 'generating', 'sets', 'of', 'solutions,', 'linear', 'constraints.'],
+]
+
+
+@pytest.fixture
+def docs():
+    return list(DOCS)
+
+
+@pytest.fixture
+def texts():
+    return [doc for doc in DOCS if isinstance(doc, str)]
+
+
+@pytest.fixture(params=[b'', b'x' * 7, b'x' * 100])
+def foreign_file(request, tmp_path):
+    # a file that none of the binary formats should accept
+    path = tmp_path / 'foreign.bin'
+    path.write_bytes(request.param)
+    return str(path)
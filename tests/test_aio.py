@@ -0,0 +1,36 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from rake.rake import Rake
+from rake.aio import AsyncRake
+
+
+def test_async_rake_matches_run(texts):
+    docs = texts * 6
+
+    async def main():
+        with ThreadPoolExecutor(2) as executor:
+            extractor = AsyncRake(executor=executor, max_in_flight=4, batch_size=3)
+            return await asyncio.gather(*[extractor.run(doc, top_k=3) for doc in docs])
+
+    results = asyncio.run(main())
+    assert results == [Rake().run(doc, top_k=3) for doc in docs]
+
+
+def test_async_rake_partial_batch_and_errors(texts):
+    async def main():
+        extractor = AsyncRake(batch_size=100, batch_delay=0.01)
+        good = extractor.run(texts[0])
+        bad = extractor.run(texts[1], top_k=-1)
+        return await asyncio.gather(good, bad, return_exceptions=True)
+
+    good, bad = asyncio.run(main())
+    assert good == Rake().run(texts[0])
+    assert isinstance(bad, ValueError)
+
+
+def test_async_rake_rejects_empty_batches():
+    with pytest.raises(ValueError):
+        AsyncRake(batch_size=0)
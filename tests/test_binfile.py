@@ -0,0 +1,33 @@
+import os
+
+import pytest
+
+from rake.rake import Rake
+from rake.columnar import KeywordBatch
+from rake.idf import IdfIndex, IdfIndexBuilder
+from rake.index import KeywordIndex, KeywordIndexBuilder
+
+
+@pytest.mark.parametrize('reader', [IdfIndex, KeywordIndex, KeywordBatch])
+def test_readers_reject_other_files(reader, foreign_file):
+    with pytest.raises(ValueError):
+        reader(foreign_file)
+
+
+@pytest.mark.parametrize('writer', [
+    lambda docs: IdfIndexBuilder().add_many(docs),
+    lambda docs: KeywordIndexBuilder().add_many(Rake().run_many(docs)),
+    lambda docs: Rake().run_batch(docs),
+])
+def test_failed_write_leaves_no_temporary_file(tmp_path, monkeypatch, docs, writer):
+    path = tmp_path / 'keywords.bin'
+    path.write_bytes(b'old')
+
+    def fail(src, dst):
+        raise OSError('disk full')
+
+    monkeypatch.setattr(os, 'replace', fail)
+    with pytest.raises(OSError):
+        writer(docs).write(str(path))
+    assert os.listdir(str(tmp_path)) == ['keywords.bin']
+    assert path.read_bytes() == b'old'
@@ -0,0 +1,73 @@
+import pytest
+
+from rake.rake import Rake
+from rake.cache import CachedRake
+
+
+TEXT = ("Compatibility of systems of linear constraints over the set of natural numbers. "
+        "Criteria of compatibility of a system of linear Diophantine equations, strict "
+        "inequations, and nonstrict inequations are considered.")
+
+
+def test_cache_hits_and_misses():
+    cache = CachedRake(maxsize=2)
+    expected = Rake().run(TEXT)
+
+    assert cache.run(TEXT) == expected
+    assert cache.run(TEXT) == expected
+    assert cache.run(TEXT, top_k=2) == expected[:2]
+    assert cache.run(TEXT, top_fraction=0.5) == expected[:len(expected) // 2]
+    assert cache.cache_info() == (3, 0, 1, 2, 1)
+
+    # tokenized input is a different document
+    assert cache.run(TEXT.split()) == Rake().run(TEXT.split())
+    assert cache.cache_info().misses == 2
+
+    # tokens are not joined with a separator that could occur in them
+    assert cache._key(['alpha\x00beta', 'gamma,']) != cache._key(['alpha', 'beta', 'gamma,'])
+
+
+def test_cache_lru_eviction():
+    cache = CachedRake(maxsize=2)
+    cache.run('alpha beta, ')
+    cache.run('gamma delta, ')
+    cache.run('alpha beta, ')
+    cache.run('epsilon zeta, ')
+    assert cache.cache_info().currsize == 2
+
+    cache.run('alpha beta, ')
+    assert cache.cache_info().misses == 3
+    cache.run('gamma delta, ')
+    assert cache.cache_info().misses == 4
+
+
+def test_cache_config_in_key():
+    fox = CachedRake(Rake('fox'))
+    smart = CachedRake(Rake('smart'))
+    assert fox._key(TEXT) != smart._key(TEXT)
+    assert fox._key(TEXT) == CachedRake(Rake('fox'))._key(TEXT)
+    assert fox._key(TEXT) != CachedRake(Rake('fox', adjoining=True))._key(TEXT)
+
+
+def test_cache_disk_tier(tmpdir):
+    path = str(tmpdir.join('keywords.sqlite'))
+    expected = Rake().run(TEXT)
+
+    first = CachedRake(path=path)
+    assert first.run(TEXT) == expected
+    first.close()
+
+    second = CachedRake(path=path)
+    assert second.run(TEXT) == expected
+    assert second.run(TEXT) == expected
+    assert second.cache_info() == (1, 1, 0, 1024, 1)
+
+    second.cache_clear()
+    assert second.run(TEXT) == expected
+    assert second.cache_info().misses == 1
+    second.close()
+
+
+def test_cache_rejects_negative_size():
+    with pytest.raises(ValueError):
+        CachedRake(maxsize=-1)
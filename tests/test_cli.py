@@ -0,0 +1,98 @@
+import io
+import json
+import sys
+
+import pytest
+
+from rake.cli import main
+from rake.rake import Rake
+from rake.stoplists import register_stopwords
+
+
+def _expected(docs, top_k=10):
+    return [[[kw.keyword, kw.score] for kw in keywords]
+            for keywords in Rake().run_many(docs, top_k=top_k)]
+
+
+def _run(argv, capsys):
+    assert main(argv + ['--quiet']) == 0
+    return [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+
+
+@pytest.fixture
+def corpus(tmp_path, texts):
+    (tmp_path / 'sub').mkdir()
+    for i, text in enumerate(texts):
+        (tmp_path / ('sub' if i else '.') / '{}.txt'.format(i)).write_text(text, encoding='utf-8')
+    return tmp_path
+
+
+@pytest.mark.parametrize('jobs', ['1', '2'])
+def test_cli_files(corpus, capsys, texts, jobs):
+    results = _run([str(corpus), '-j', jobs], capsys)
+    sources = [corpus / '0.txt'] + [corpus / 'sub' / '{}.txt'.format(i) for i in range(1, len(texts))]
+    assert [r['source'] for r in results] == [str(path) for path in sources]
+    assert [r['keywords'] for r in results] == _expected(texts)
+
+    results = _run([str(corpus / '**' / '*.txt'), '-k', '1', '-j', jobs], capsys)
+    assert [r['keywords'] for r in results] == _expected(texts, top_k=1)
+
+
+@pytest.mark.parametrize('jobs', ['1', '2'])
+def test_cli_lines_and_jsonl(tmp_path, capsys, texts, jobs):
+    path = tmp_path / 'docs.txt'
+    path.write_text(texts[0] + '\n\n' + texts[1] + '\n' + texts[2] + '\n', encoding='utf-8')
+    results = _run([str(path), '--format', 'lines', '-j', jobs, '--chunksize', '1'], capsys)
+    assert [r['line'] for r in results] == [1, 3, 4]
+    assert [r['keywords'] for r in results] == _expected(texts[:3])
+
+    path = tmp_path / 'docs.jsonl'
+    path.write_text('\n'.join(json.dumps({'id': i, 'body': text}) for i, text in enumerate(texts)),
+                    encoding='utf-8')
+    output = tmp_path / 'out.jsonl'
+    assert main([str(path), '-f', 'jsonl', '--text-field', 'body', '-j', jobs,
+                 '-o', str(output), '-q']) == 0
+    results = [json.loads(line) for line in output.read_text(encoding='utf-8').splitlines()]
+    assert [r['id'] for r in results] == list(range(len(texts)))
+    assert [r['keywords'] for r in results] == _expected(texts)
+
+
+def test_cli_stdin(monkeypatch, capsys, texts):
+    stdin = io.TextIOWrapper(io.BytesIO('\n'.join(texts).encode('utf-8')))
+    monkeypatch.setattr(sys, 'stdin', stdin)
+    results = _run([], capsys)
+    assert [r['source'] for r in results] == ['-'] * len(texts)
+    assert [r['keywords'] for r in results] == _expected(texts)
+
+    stdin.buffer.seek(0)
+    results = _run(['-', '--format', 'text', '-k', '0'], capsys)
+    assert [r['keywords'] for r in results] == _expected([' '.join(texts)], top_k=None)
+
+
+def test_cli_errors(tmp_path, capsys):
+    with pytest.raises(SystemExit):
+        main([str(tmp_path / 'missing.txt')])
+    with pytest.raises(SystemExit):
+        main([str(tmp_path / '*.txt')])
+
+    path = tmp_path / 'docs.jsonl'
+    path.write_text('{"text": "natural numbers"}\n{"body": "linear systems"}\n', encoding='utf-8')
+    assert main([str(path), '-f', 'jsonl', '-q']) == 1
+    assert 'docs.jsonl:2' in capsys.readouterr().err
+
+    for text in ['12345', 'null', '["natural", 1]']:
+        path.write_text('{"text": "natural numbers"}\n{"text": %s}\n' % text, encoding='utf-8')
+        assert main([str(path), '-f', 'jsonl', '-q']) == 1
+        assert 'docs.jsonl:2' in capsys.readouterr().err
+
+
+def test_cli_registered_stoplist(tmp_path, capsys, texts):
+    register_stopwords('cli-test', words=['of', 'the', 'a', 'over', 'for', 'are'])
+    path = tmp_path / 'docs.txt'
+    path.write_text(texts[0], encoding='utf-8')
+    results = _run([str(path), '-s', 'CLI-Test', '-k', '0'], capsys)
+    assert results[0]['keywords'] == [[kw.keyword, kw.score] for kw in Rake('cli-test').run(texts[0])]
+
+    with pytest.raises(SystemExit):
+        main([str(path), '-s', 'missing'])
+    assert 'missing' in capsys.readouterr().err
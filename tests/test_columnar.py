@@ -0,0 +1,49 @@
+import pytest
+
+from rake.rake import Rake
+from rake.columnar import KeywordBatch
+
+
+@pytest.fixture
+def docs(docs):
+    # with an empty and a non-ASCII document
+    return docs + ["", "Überprüfung of linear constraints and minimal solutions, again."]
+
+
+@pytest.mark.parametrize('top_k', [None, 2])
+def test_run_batch_matches_run_many(docs, top_k):
+    rake = Rake(adjoining=True)
+    expected = list(rake.run_many(docs, top_k=top_k))
+    batch = rake.run_batch(iter(docs), top_k=top_k)
+    assert len(batch) == len(docs)
+    assert list(batch) == expected
+    assert batch[-1] == expected[-1]
+    assert batch.n_rows == sum(len(keywords) for keywords in expected)
+    assert batch.n_strings == len({kw.keyword for keywords in expected for kw in keywords})
+    assert list(KeywordBatch().extend(expected)) == expected
+    with pytest.raises(IndexError):
+        batch[len(docs)]
+
+
+def test_batch_file_roundtrip(tmp_path, docs):
+    rake = Rake()
+    batch = rake.run_batch(docs * 3)
+    path = str(tmp_path / 'keywords.col')
+    batch.write(path)
+    with KeywordBatch(path) as mapped:
+        assert list(mapped) == list(batch)
+        assert list(mapped.score) == list(batch.score)
+        assert list(mapped.doc_offsets) == list(batch.doc_offsets)
+        assert mapped.keyword(mapped.keyword_ids[0]) == batch[0][0].keyword
+        with pytest.raises(ValueError):
+            mapped.append(batch[0])
+
+        # a mapped batch can be written again
+        mapped.write(str(tmp_path / 'copy.col'))
+    with open(path, 'rb') as f, open(str(tmp_path / 'copy.col'), 'rb') as g:
+        assert f.read() == g.read()
+
+    empty = str(tmp_path / 'empty.col')
+    KeywordBatch().write(empty)
+    with KeywordBatch(empty) as mapped:
+        assert len(mapped) == 0 and list(mapped) == []
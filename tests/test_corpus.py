@@ -0,0 +1,53 @@
+import pytest
+
+from rake.rake import Rake
+from rake.corpus import CorpusRake
+
+
+def test_corpus_matches_concatenated_run(texts):
+    rake = Rake()
+    expected = rake.run(' '.join(texts))
+    expected_words = sorted(rake.word_scores, key=lambda x: x.score, reverse=True)
+
+    corpus = CorpusRake(rake).add_many(texts)
+    assert corpus.n_documents == len(texts)
+    assert corpus.keyword_scores() == expected
+    assert corpus.word_scores() == expected_words
+    assert corpus.phrase_counts['minimal set'] == 2
+
+
+def test_corpus_merge_shards(texts):
+    whole = CorpusRake().add_many(texts)
+    left = CorpusRake().add_many(texts[:2])
+    right = CorpusRake().add_many(texts[2:])
+
+    merged = left.merge(right)
+    assert merged.n_documents == whole.n_documents
+    assert merged.keyword_scores() == whole.keyword_scores()
+    assert merged.word_scores() == whole.word_scores()
+    assert merged.phrase_counts == whole.phrase_counts
+
+
+def test_corpus_adjoining():
+    docs = ["The axis of evil is here. ", "Linear constraints. ", "The axis of evil is there. "]
+    rake = Rake(adjoining=True)
+    expected = rake.run(''.join(docs))
+    assert 'axis of evil' in [kw.keyword for kw in expected]
+    assert CorpusRake(rake).add_many(docs).keyword_scores() == expected
+    merged = CorpusRake(rake).add_many(docs[:1]).merge(CorpusRake(rake).add_many(docs[1:]))
+    assert merged.keyword_scores() == expected
+
+
+def test_corpus_merge_rejects_other_stopwords():
+    with pytest.raises(ValueError):
+        CorpusRake(Rake('fox')).merge(CorpusRake(Rake('smart')))
+
+
+def test_corpus_rejects_other_documents(texts):
+    corpus = CorpusRake(Rake(adjoining=True)).add_many(texts)
+    expected = corpus.keyword_scores()
+    for doc in (b'linear systems', None, ['linear', 1]):
+        with pytest.raises(TypeError):
+            corpus.add(doc)
+    assert corpus.n_documents == len(texts)
+    assert corpus.keyword_scores() == expected
@@ -0,0 +1,93 @@
+import math
+import pickle
+
+import pytest
+
+from rake.rake import Rake
+from rake.cache import CachedRake
+from rake.corpus import CorpusRake
+from rake.idf import IdfIndexBuilder
+from rake.parallel import ParallelRake
+from rake.window import WindowedRake
+
+
+@pytest.fixture
+def index(tmp_path, docs):
+    with IdfIndexBuilder().add_many(docs).write(str(tmp_path / 'corpus.idf')) as index:
+        yield index
+
+
+def test_idf_frequencies(index, docs):
+    assert index.n_documents == len(docs)
+    # counted once per document, however often it appears in it
+    assert index.phrase_frequency('linear constraints') == 3
+    assert index.phrase_frequency('compatibility') == 2
+    assert index.phrase_frequency('unseen phrase') == 0
+    assert index.word_frequency('linear') == 4
+    assert index.word_frequency('linear constraints') == 0
+    assert index.idf('compatibility') == math.log(6 / 3) + 1
+    assert index.idf('unseen phrase') == math.log(6) + 1
+    assert len(index) == len({p for d in docs for p in Rake()._generate_candidate_keywords(d)}) + \
+        len({w for d in docs for p in Rake()._generate_candidate_keywords(d) for w in p.split()})
+
+
+def test_idf_builder_merge(index, tmp_path, docs):
+    shard = IdfIndexBuilder().add_many(docs[:2]).merge(IdfIndexBuilder().add_many(docs[2:]))
+    with shard.write(str(tmp_path / 'merged.idf')) as merged:
+        assert merged.digest == index.digest
+    with pytest.raises(ValueError):
+        shard.merge(IdfIndexBuilder(Rake('smart')))
+
+
+def test_idf_builder_rejects_other_documents(index, tmp_path, docs):
+    builder = IdfIndexBuilder().add_many(docs)
+    with pytest.raises(TypeError):
+        builder.add(b'linear systems')
+    with builder.write(str(tmp_path / 'rejected.idf')) as written:
+        assert written.digest == index.digest
+
+
+def test_idf_weighting(index, docs):
+    rake = Rake(idf=index)
+    text = docs[3] + " Minimal compatibility."
+    plain = Rake()
+    expected = {kw.keyword: kw.score * index.idf(kw.keyword) for kw in plain.run(text)}
+    keywords = rake.run(text)
+    assert {kw.keyword: kw.score for kw in keywords} == expected
+    assert [kw.score for kw in keywords] == sorted(expected.values(), reverse=True)
+    assert rake.word_scores == plain.word_scores
+
+    assert CachedRake(rake)._key(text) != CachedRake()._key(text)
+
+    restored = pickle.loads(pickle.dumps(rake))
+    assert restored.run(text) == rake.run(text)
+    parallel = ParallelRake(rake, processes=2, chunksize=1)
+    assert list(parallel.run_many(docs)) == list(rake.run_many(docs))
+
+
+def test_idf_weighting_in_corpus_and_window(index, docs):
+    rake = Rake(idf=index)
+    expected = rake.run(' '.join(docs[:4]))
+    assert expected != Rake().run(' '.join(docs[:4]))
+    assert CorpusRake(rake).add_many(docs[:4]).keyword_scores() == expected
+    window = WindowedRake(rake, max_documents=4).add(docs[4])
+    for doc in docs[:4]:
+        window.add(doc)
+    assert window.keyword_scores(top_k=3) == expected[:3]
+
+
+def test_idf_adjoining(tmp_path):
+    docs = ["The axis of evil is here, the axis of evil is there.", "Axis of evil.",
+            "The axis of evil is gone, the axis of evil is back."]
+    rake = Rake(adjoining=True)
+    builder = IdfIndexBuilder(rake).add_many(docs)
+    with builder.write(str(tmp_path / 'adjoining.idf')) as index:
+        # counted where `Rake.run` returns it
+        assert index.phrase_frequency('axis of evil') == 2
+        weighted = Rake(adjoining=True, idf=index).run(docs[0])
+        assert {kw.keyword: kw.score for kw in weighted} == {
+            kw.keyword: kw.score * index.idf(kw.keyword) for kw in rake.run(docs[0])}
+    with IdfIndexBuilder().add_many(docs).write(str(tmp_path / 'plain.idf')) as index:
+        assert index.phrase_frequency('axis of evil') == 0
+    with pytest.raises(ValueError):
+        builder.merge(IdfIndexBuilder())
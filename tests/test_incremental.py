@@ -0,0 +1,61 @@
+import random
+
+import pytest
+
+from rake.rake import Rake
+from rake.idf import IdfIndexBuilder
+from rake.incremental import IncrementalRake
+
+
+TEXT = ("Compatibility of systems of linear constraints over the set of natural numbers. "
+        "Criteria of compatibility of a system of linear Diophantine equations, strict "
+        "inequations, and nonstrict inequations are considered.\nUpper bounds for components "
+        "of a minimal set of solutions and algorithms of construction of minimal generating "
+        "sets of solutions for all types of systems are given. These criteria and the "
+        "corresponding algorithms for constructing a minimal supporting set of solutions")
+
+
+def test_incremental_matches_full_run():
+    random.seed(0)
+    incremental = IncrementalRake()
+    start = 0
+    while start < len(TEXT):
+        end = start + random.randint(1, 30)
+        incremental.append(TEXT[start:end])
+        start = end
+
+        rake = Rake()
+        expected = rake.run(TEXT[:end])
+        assert incremental.keyword_scores() == expected
+        assert incremental.word_scores() == rake.word_scores
+        assert incremental.keyword_scores(top_k=3) == expected[:3]
+    assert incremental.length == len(TEXT)
+
+
+def test_incremental_query_does_not_change_state():
+    incremental = IncrementalRake().append("linear Diophantine equations.")
+    before = incremental.keyword_scores()
+    incremental.append(" minimal set")
+    incremental.keyword_scores()
+    incremental.append("s,")
+    assert incremental.keyword_scores() == Rake().run("linear Diophantine equations. minimal sets,")
+    assert before == Rake().run("linear Diophantine equations.")
+
+
+@pytest.mark.parametrize('options', [{'adjoining': True}, {'idf': True},
+                                     {'adjoining': True, 'idf': True}])
+def test_incremental_honours_options(tmp_path, options):
+    text = TEXT + " The axis of evil is here, the axis of evil is there. Systems of linear constraints."
+    if options.get('idf'):
+        options['idf'] = IdfIndexBuilder().add_many(TEXT.split('. ')).write(str(tmp_path / 'idf'))
+    random.seed(1)
+    incremental = IncrementalRake(Rake(**options))
+    start = 0
+    while start < len(text):
+        end = start + random.randint(1, 30)
+        incremental.append(text[start:end])
+        start = end
+        expected = Rake(**options).run(text[:end])
+        assert incremental.keyword_scores() == expected
+        assert incremental.keyword_scores(top_k=2) == expected[:2]
+    assert ('axis of evil' in [kw.keyword for kw in expected]) == options.get('adjoining', False)
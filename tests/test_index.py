@@ -0,0 +1,71 @@
+import pytest
+
+from rake.rake import Rake
+from rake.index import KeywordIndexBuilder
+
+
+@pytest.fixture
+def results(docs):
+    docs = docs + ["Überprüfung of linear constraints and minimal solutions, again."]
+    return list(Rake().run_many(docs * 40))
+
+
+def _postings(results):
+    postings = {}
+    for doc_id, keywords in enumerate(results):
+        for kw in keywords:
+            postings.setdefault(kw.keyword, []).append((doc_id, kw.score))
+    return postings
+
+
+@pytest.mark.parametrize('top_size', [0, 3, 64])
+def test_index_lookup(tmp_path, results, top_size):
+    builder = KeywordIndexBuilder(top_size=top_size)
+    with builder.add_many(results).write(str(tmp_path / 'keywords.idx')) as index:
+        postings = _postings(results)
+        assert index.n_documents == len(results)
+        assert len(index) == len(postings)
+        assert list(index.terms()) == sorted(postings)
+        assert list(index.terms('linear')) == sorted(t for t in postings if t.startswith('linear'))
+        for keyword, expected in postings.items():
+            assert keyword in index
+            assert index.lookup(keyword) == expected
+            doc_ids, scores = index.postings(keyword)
+            assert list(zip(doc_ids, scores)) == expected
+            assert index.document_frequency(keyword) == len(expected)
+            by_score = sorted(expected, key=lambda x: -x[1])
+            for k in (1, 3, 10, 1000):
+                assert index.top_documents(keyword, k) == by_score[:k]
+        assert 'missing keyword' not in index
+        assert index.lookup('missing keyword') == []
+        assert [list(a) for a in index.postings('missing keyword')] == [[], []]
+        assert index.top_documents('missing keyword') == []
+
+
+def test_index_forward(tmp_path, results):
+    with KeywordIndexBuilder().add_many(results).write(str(tmp_path / 'keywords.idx')) as index:
+        for doc_id in (0, 4, len(results) - 1):
+            assert index.keywords(doc_id) == [(kw.keyword, kw.score) for kw in results[doc_id]]
+        with pytest.raises(IndexError):
+            index.keywords(len(results))
+
+        totals = {}
+        for doc_id, keywords in enumerate(results):
+            if any(kw.keyword == 'linear constraints' for kw in keywords):
+                for kw in keywords:
+                    totals[kw.keyword] = totals.get(kw.keyword, 0.0) + kw.score
+        del totals['linear constraints']
+        expected = sorted(totals.items(), key=lambda x: -x[1])[:3]
+        assert index.top_keywords('linear constraints', k=3) == expected
+        assert index.top_keywords('linear constraints', k=3, max_documents=5)
+
+    path = str(tmp_path / 'inverted.idx')
+    with KeywordIndexBuilder(forward=False).add_many(results).write(path) as index:
+        assert index.lookup('minimal solutions') == _postings(results)['minimal solutions']
+        with pytest.raises(ValueError):
+            index.keywords(0)
+
+
+def test_index_rejects_negative_top_size():
+    with pytest.raises(ValueError):
+        KeywordIndexBuilder(top_size=-1)
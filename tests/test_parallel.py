@@ -0,0 +1,55 @@
+import pytest
+
+from rake.rake import Rake
+from rake.parallel import ParallelRake
+
+
+@pytest.mark.parametrize('chunksize', [1, 3, 100])
+def test_parallel_ordered_matches_sequential(docs, chunksize):
+    docs = docs * 7
+    rake = Rake('smart')
+    expected = list(rake.run_many(docs, top_k=3))
+    parallel = ParallelRake(rake, processes=2, chunksize=chunksize, max_pending=2)
+    assert list(parallel.run_many(iter(docs), top_k=3)) == expected
+
+
+def test_parallel_unordered_matches_sequential(docs):
+    docs = docs * 7
+    expected = list(Rake().run_many(docs))
+    parallel = ParallelRake(processes=2, chunksize=4, max_pending=1)
+    results = list(parallel.run_many(iter(docs), ordered=False))
+    assert sorted(i for i, _ in results) == list(range(len(docs)))
+    assert [keywords for _, keywords in sorted(results)] == expected
+
+
+def test_parallel_top_fraction(tmp_path, texts):
+    rake = Rake()
+    expected = list(rake.run_many(texts, top_k=2, top_fraction=1 / 3))
+    parallel = ParallelRake(rake, processes=2, chunksize=2)
+    assert list(parallel.run_many(iter(texts), top_k=2, top_fraction=1 / 3)) == expected
+    assert list(parallel.run_many(texts, top_fraction=1 / 3)) == list(
+        rake.run_many(texts, top_fraction=1 / 3))
+
+    paths = []
+    for i, text in enumerate(texts):
+        path = tmp_path / '{}.txt'.format(i)
+        path.write_text(text, encoding='utf-8')
+        paths.append(str(path))
+    assert list(parallel.run_files(paths, top_fraction=1 / 3)) == list(
+        rake.run_many(texts, top_fraction=1 / 3))
+
+
+def test_parallel_rejects_empty_chunks():
+    with pytest.raises(ValueError):
+        ParallelRake(chunksize=0)
+
+
+def test_parallel_run_files(tmp_path, texts):
+    paths = []
+    for i, text in enumerate(texts):
+        path = tmp_path / '{}.txt'.format(i)
+        path.write_text(text, encoding='utf-8')
+        paths.append(str(path))
+    expected = list(Rake().run_many(texts, top_k=2))
+    parallel = ParallelRake(processes=2, chunksize=2)
+    assert list(parallel.run_files(iter(paths), top_k=2)) == expected
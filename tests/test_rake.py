@@ -1,14 +1,17 @@
 import operator
+import re
 
 import pytest
 
-from rake.rake import (
-    Rake,
+from rake.rake import Rake, RakeStats
+from rake.rake_old import (
     is_number,
+    separate_words,
     split_sentences,
     load_stopword_list,
     calculate_word_scores,
     build_stop_word_regex,
+    build_stop_word_matcher,
     generate_candidate_keywords,
     generate_candidate_keyword_scores,
 )
@@ -74,3 +77,316 @@ def test_is_number():
     assert not is_number('My Cousin Vinny')
     assert not is_number('200 + 0.00')
     assert not is_number('My Cousin 2 Removed, Vinny')
+
+
+@pytest.mark.parametrize('source', ['fox', 'smart'])
+def test_rake_pipeline_compiled_once(source):
+    rake = Rake(source)
+    pipeline = rake._pipeline
+    assert isinstance(pipeline.stopwords, frozenset)
+    assert pipeline.stopwords == frozenset(load_stopword_list(source))
+
+    first = rake.run("Compatibility of systems of linear constraints, and more.")
+    second = rake.run("Compatibility of systems of linear constraints, and more.")
+    assert first == second
+    assert rake._pipeline is pipeline
+
+
+def test_rake_unknown_stopword_source():
+    with pytest.raises(ValueError):
+        Rake('nonsense')
+
+
+def _reference_scores(candidate_keywords):
+    # straightforward quadratic formulation of RAKE scoring
+    degree = {}
+    freq = {}
+    for keyword in candidate_keywords:
+        word_list = keyword.split()
+        for word in word_list:
+            degree[word] = degree.get(word, 0) + len(word_list)
+            freq[word] = freq.get(word, 0) + 1
+    word_scores = {word: round(degree[word] / freq[word], 2) for word in degree}
+    keyword_scores = set()
+    for keyword in set(candidate_keywords):
+        words = [w for w in degree if w in keyword.split()]
+        keyword_scores.add((keyword,
+                            sum(degree[w] for w in words),
+                            sum(freq[w] for w in words),
+                            sum(word_scores[w] for w in words)))
+    return word_scores, keyword_scores
+
+
+@pytest.mark.parametrize('source', ['fox', 'smart'])
+def test_rake_scores_match_reference(source):
+    text = ("Compatibility of systems of linear constraints over the set of natural numbers. "
+            "Criteria of compatibility of a system of linear Diophantine equations, strict "
+            "inequations, and nonstrict inequations are considered. linear linear systems, "
+            "Upper bounds for components of a minimal set of solutions are given.")
+    rake = Rake(source)
+    keywords = rake.run(text)
+    candidates = rake._generate_candidate_keywords(text)
+    word_scores, keyword_scores = _reference_scores(candidates)
+
+    assert {ws.word: ws.score for ws in rake.word_scores} == word_scores
+    assert set(keywords) == keyword_scores
+    assert [k.score for k in keywords] == sorted((k.score for k in keywords), reverse=True)
+
+
+def test_rake_run_many():
+    docs = [
+        "Compatibility of systems of linear constraints over the set of natural numbers.",
+        "Criteria of compatibility of a system of linear Diophantine equations, strict inequations.",
+        ['upper', 'bounds', 'for', 'components', 'of', 'a', 'minimal', 'set.'],
+    ]
+    rake = Rake()
+    results = rake.run_many(iter(docs), top_k=2)
+    assert not isinstance(results, list)
+    results = list(results)
+
+    assert len(results) == len(docs)
+    for doc, keywords in zip(docs, results):
+        assert keywords == Rake().run(doc)[:2]
+    assert isinstance(rake.keyword_scores, str)
+
+
+@pytest.mark.parametrize('doc', [b'linear systems', None, 12345, ['linear', 1]])
+def test_rake_rejects_other_documents(doc):
+    rake = Rake()
+    with pytest.raises(TypeError):
+        list(rake.run_many(["Linear constraints.", doc]))
+    with pytest.raises(TypeError):
+        rake.run_batch(["Linear constraints.", doc])
+    with pytest.raises(TypeError):
+        rake.run(doc)
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 7, 64, 1 << 16])
+def test_rake_run_stream(chunk_size):
+    import io
+
+    text = ("Compatibility of systems of linear constraints over the set of natural numbers.\n"
+            "Criteria of compatibility of a system of linear Diophantine equations,\tstrict "
+            "inequations,  and nonstrict inequations are considered. Upper bounds for "
+            "components of a minimal set of solutions and algorithms of construction "
+            "of minimal generating sets of solutions for all types of systems are given")
+    rake = Rake()
+    expected = rake.run(text)
+    expected_words = rake.word_scores
+
+    streamed = Rake()
+    assert streamed.run_stream(io.StringIO(text), chunk_size=chunk_size) == expected
+    assert streamed.word_scores == expected_words
+
+    chunks = (text[i:i + chunk_size] for i in range(0, len(text), chunk_size))
+    assert Rake().run_stream(chunks) == expected
+
+
+def test_rake_run_stream_long_token():
+    # a token cut by thousands of chunk boundaries is joined once, which
+    # took seconds when every chunk copied and rescanned the pending text
+    token = 'x' * (4 << 20)
+    text = 'linear constraints ' + token + ' of natural numbers'
+    expected = Rake().run(text)
+    assert expected[0].keyword == 'linear constraints ' + token
+    chunks = (text[i:i + 1000] for i in range(0, len(text), 1000))
+    assert Rake().run_stream(chunks) == expected
+
+
+@pytest.mark.parametrize('scan_size', [1, 5, 64])
+def test_rake_scans_long_documents_in_slices(monkeypatch, scan_size):
+    text = ("Compatibility of systems of linear constraints over the set of natural numbers.\n"
+            "Criteria of compatibility of a system of linear Diophantine equations,\tstrict "
+            "inequations,  and nonstrict inequations are considered. Upper bounds for "
+            "components of a minimal set of solutions and algorithms of construction")
+    rake = Rake(adjoining=True)
+    expected = rake.run(text)
+    expected_words = rake.word_scores
+    expected_tokens = Rake().run(text.split(' '))
+
+    monkeypatch.setattr('rake.rake._SCAN_SIZE', scan_size)
+    assert rake.run(text) == expected
+    assert rake.word_scores == expected_words
+    assert Rake().run(text.split(' ')) == expected_tokens
+
+
+@pytest.mark.parametrize('chunk_size', [1, 5, 1 << 20])
+def test_rake_run_file(tmpdir, chunk_size):
+    text = ("Compatibility of systems of linear constraints over the set of natural numbers.\r\n"
+            "Critères de compatibilité of a système of linear Diophantine equations,\tstrict "
+            "inéquations — and nonstrict inequations are considered. Upper bounds for "
+            "components of a minimal set of solutions, 集合 of minimal generating sets.\n")
+    path = tmpdir.join('doc.txt')
+    path.write_binary(text.encode('utf-8'))
+
+    with open(str(path), encoding='utf-8') as f:
+        expected = Rake().run(f.read())
+    assert expected
+    assert Rake().run_file(str(path), chunk_size=chunk_size) == expected
+
+
+def test_rake_run_file_empty(tmpdir):
+    path = tmpdir.join('empty.txt')
+    path.write_binary(b'')
+    assert Rake().run_file(str(path)) == []
+
+
+def test_rake_top_keywords():
+    text = ("Compatibility of systems of linear constraints over the set of natural numbers. "
+            "Criteria of compatibility of a system of linear Diophantine equations, strict "
+            "inequations, and nonstrict inequations are considered. Upper bounds for components "
+            "of a minimal set of solutions and algorithms of construction of minimal generating "
+            "sets of solutions for all types of systems are given. ")
+    everything = Rake().run(text)
+    assert len(everything) > 6
+
+    assert Rake().run(text, top_k=5) == everything[:5]
+    assert Rake().run(text, top_k=0) == []
+    assert Rake().run(text, top_k=1000) == everything
+    assert Rake().run(text, top_fraction=1 / 3) == everything[:len(everything) // 3]
+    assert Rake().run(text, top_k=2, top_fraction=0.5) == everything[:2]
+
+    # ties keep first-appearance order
+    ties = Rake().run("alpha beta, gamma delta, epsilon zeta, eta theta, ")
+    assert [k.keyword for k in ties] == ['alpha beta', 'gamma delta', 'epsilon zeta', 'eta theta']
+    assert Rake().run("alpha beta, gamma delta, epsilon zeta, eta theta, ", top_k=2) == ties[:2]
+
+    with pytest.raises(ValueError):
+        Rake().run(text, top_fraction=1.5)
+    with pytest.raises(ValueError):
+        Rake().run(text, top_k=-1)
+
+
+def test_rake_numpy_backend_matches_python():
+    pytest.importorskip('numpy')
+    import random
+
+    random.seed(0)
+    vocab = ['linear', 'systems', 'Diophantine', 'equations,', 'minimal', 'set.', '(sets',
+             'of', 'the', 'and', 'a', 'for', 'natural', 'numbers', 'solutions', 'criteria;']
+    texts = [' '.join(random.choice(vocab) for _ in range(n)) for n in (0, 1, 5, 50, 2000)]
+    for text in texts:
+        python = Rake(backend='python')
+        numpy = Rake(backend='numpy')
+        assert numpy._backend is not None
+        assert numpy.run(text) == python.run(text)
+        assert numpy.word_scores == python.word_scores
+        assert numpy.run(text, top_k=3) == python.run(text, top_k=3)
+
+
+def test_rake_unknown_backend():
+    with pytest.raises(ValueError):
+        Rake(backend='nonsense')
+
+
+def test_rake_numpy_backend_fallback(monkeypatch):
+    import sys
+
+    monkeypatch.setitem(sys.modules, 'numpy', None)
+    monkeypatch.delitem(sys.modules, 'rake._numpy_backend', raising=False)
+    rake = Rake(backend='numpy')
+    assert rake._backend is None
+    assert rake.run("natural numbers, linear systems.") == Rake().run("natural numbers, linear systems.")
+
+
+def test_rake_candidate_boundaries():
+    rake = Rake()
+    text = ("Hello, big World of (tiny things) and-more.\n\nalpha  BETA. gamma\tdelta; - "
+            "epsilon zeta, the eta theta\r\niota - kappa\x0blambda mu: open phrase")
+    expected = ['world', 'alpha beta', 'gamma delta', 'epsilon zeta',
+                'eta theta iota', 'kappa lambda mu']
+    assert rake._generate_candidate_keywords(text) == expected
+    tokens = re.split('[ \t\n\r\x0b\x0c]', text)
+    assert rake._generate_candidate_keywords(tokens) == expected
+
+
+@pytest.mark.parametrize('source', ['fox', 'smart'])
+def test_stop_word_matcher_matches_regex(source):
+    stopwords = load_stopword_list(source)
+    regex = build_stop_word_regex(stopwords)
+    matcher = build_stop_word_matcher(stopwords)
+    assert matcher is not regex
+
+    texts = [
+        "Compatibility of systems of linear constraints over the set of natural numbers",
+        "THE Set OF natural numbers, which-is not ain't it's c'mon can't-do it's- a's",
+        "of-the in the-end _the the_ 2the the2 I'm i'M won't've 'twas the'",
+        "\u0130t \u0131t \u017fo \u212ano \u212Aeep it|s the|of",
+        "",
+    ]
+    for text in texts:
+        assert matcher.sub('|', text) == regex.sub('|', text)
+
+    sentences = split_sentences(texts[0] + '. ' + texts[1])
+    expected = generate_candidate_keywords(sentences, regex)
+    assert generate_candidate_keywords(sentences, matcher) == expected
+
+
+def test_stop_word_matcher_falls_back_to_regex():
+    matcher = build_stop_word_matcher(['the', 'c++'])
+    assert matcher.pattern == build_stop_word_regex(['the', 'c++']).pattern
+
+
+def test_separate_words_skips_numbers():
+    words = separate_words("Q3 revenue 1_000 +5 -7 5/3 _1 1_ 2019 x-y net", 0)
+    assert words == ['q3', 'revenue', '5/3', '_1', '1_', 'x-y', 'net']
+    assert all(not is_number(word) for word in words)
+
+
+def test_rake_stats():
+    text = "Hello, big World of (tiny things) and-more. alpha BETA. gamma delta, alpha beta"
+    stats = RakeStats()
+    rake = Rake(stats=stats)
+    assert rake.run(text) == Rake().run(text)
+    list(rake.run_many([text.split(' ')]))
+
+    summary = stats.as_dict()
+    assert set(summary) == set(RakeStats.STAGES)
+    assert all(summary[stage]['calls'] == 2 for stage in RakeStats.STAGES)
+    assert summary['tokenize']['count'] == 2 * 13
+    assert summary['candidates']['count'] == 2 * 3
+    assert summary['word_scores']['count'] == 2 * 5
+    assert summary['phrase_scores']['count'] == 2 * 3
+    assert all(summary[stage]['seconds'] >= summary[stage]['max_seconds'] > 0
+               for stage in RakeStats.STAGES)
+
+    exported = stats.to_prometheus()
+    assert '# TYPE rake_stage_seconds_total counter' in exported
+    assert 'rake_stage_calls_total{stage="tokenize"} 2\n' in exported
+
+    stats.reset()
+    assert stats.as_dict()['tokenize'] == {'calls': 0, 'seconds': 0.0, 'max_seconds': 0.0, 'count': 0}
+
+    # streamed text is timed once per document, whatever the chunking
+    assert rake.run_stream(text[i:i + 7] for i in range(0, len(text), 7)) == Rake().run(text)
+    assert stats.calls == dict.fromkeys(RakeStats.STAGES, 1)
+    assert stats.counts == {'tokenize': 13, 'candidates': 3, 'word_scores': 5, 'phrase_scores': 3}
+
+
+def test_rake_stats_callback():
+    records = []
+
+    class Recorder(object):
+        def record(self, stage, seconds, count):
+            records.append((stage, count))
+
+    Rake(stats=Recorder()).run("natural numbers, linear systems.")
+    assert records == [('tokenize', 4), ('candidates', 2), ('word_scores', 3), ('phrase_scores', 2)]
+
+
+def test_rake_adjoining():
+    text = ("The axis of evil is real. They named the axis of evil again, and the axis "
+            "of evil stayed. Axis, of evil: axis of  evil of fear.")
+    rake = Rake(adjoining=True)
+    keywords = rake.run(text)
+    adjoining = [kw for kw in keywords if kw.keyword not in {k.keyword for k in Rake().run(text)}]
+    # punctuation around the stopword breaks adjacency and chains are counted
+    # pair by pair, so "evil of fear" is seen only once and is dropped
+    assert [kw.keyword for kw in adjoining] == ['axis of evil']
+    axis, evil = [next(kw for kw in keywords if kw.keyword == word) for word in ('axis', 'evil')]
+    assert adjoining[0].score == axis.score + evil.score
+    assert adjoining[0].sum_deg == axis.sum_deg + evil.sum_deg
+
+    assert [kw for kw in keywords if kw not in adjoining] == Rake().run(text)
+    assert rake.run_stream(text[i:i + 3] for i in range(0, len(text), 3)) == keywords
+    assert list(rake.run_many([text, text.split(' ')], top_k=2)) == [keywords[:2]] * 2
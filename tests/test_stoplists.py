@@ -0,0 +1,41 @@
+import pytest
+
+import rake
+from rake.rake import Rake
+from rake.stoplists import get_stopwords, register_stopwords, stopword_sources
+from rake.FoxStoplist import stopwords as fox
+
+
+def test_builtin_stopwords_are_shared():
+    assert get_stopwords('fox') == frozenset(fox)
+    assert get_stopwords(' FOX ') is get_stopwords('fox')
+    assert Rake()._pipeline.stopwords is Rake('Fox')._pipeline.stopwords
+    assert {'fox', 'smart'} <= set(stopword_sources())
+    with pytest.raises(ValueError):
+        get_stopwords('nonsense')
+
+
+def test_register_stopwords_from_file(tmp_path):
+    path = tmp_path / 'stopwords.txt'
+    path.write_text('# team list\nOf\n\n  the \nand\n', encoding='utf-8')
+    register_stopwords('Team', path=str(path))
+    assert get_stopwords('team') == {'of', 'the', 'and'}
+
+    keywords = Rake('team').run("Systems of linear constraints and the natural numbers, here.")
+    assert [kw.keyword for kw in keywords] == ['linear constraints', 'natural numbers', 'systems']
+
+    register_stopwords('team', words=['Systems', 'of'])
+    assert get_stopwords('team') == {'systems', 'of'}
+    with pytest.raises(ValueError):
+        register_stopwords('team')
+    with pytest.raises(ValueError):
+        register_stopwords('team', path=str(path), words=['of'])
+
+
+def test_package_exports():
+    from rake.parallel import ParallelRake
+    assert rake.ParallelRake is ParallelRake
+    assert rake.Rake is Rake
+    assert set(rake.__all__) <= set(dir(rake))
+    with pytest.raises(AttributeError):
+        rake.nonsense
@@ -0,0 +1,79 @@
+import pytest
+
+from rake.rake import Rake
+from rake.corpus import CorpusRake
+from rake.window import WindowedRake
+
+
+def _same_scores(actual, expected):
+    # equal up to rounding, as word scores are summed in a different order
+    assert sorted(k[:3] for k in actual) == sorted(k[:3] for k in expected)
+    assert [k.score for k in actual] == pytest.approx([k.score for k in expected])
+
+
+def test_window_by_document_count(texts):
+    docs = texts * 3
+    window = WindowedRake(max_documents=3)
+    for n, doc in enumerate(docs, 1):
+        window.add(doc, timestamp=n)
+        expected = CorpusRake().add_many(docs[max(0, n - 3):n])
+        assert window.n_documents == min(n, 3)
+        _same_scores(window.keyword_scores(), expected.keyword_scores())
+        assert sorted(window.word_scores()) == sorted(expected.word_scores())
+    assert len(window.keyword_scores(top_k=2)) == 2
+
+
+def test_window_by_age(texts):
+    now = [0.0]
+    window = WindowedRake(max_age=10, clock=lambda: now[0])
+    window.add(texts[0])
+    now[0] = 5
+    window.add(texts[1])
+    now[0] = 12
+    assert window.expire() == 1
+    _same_scores(window.keyword_scores(), CorpusRake().add(texts[1]).keyword_scores())
+    now[0] = 100
+    window.expire()
+    assert window.n_documents == 0
+    assert window.keyword_scores() == []
+    assert window.word_scores() == []
+
+
+def test_window_compaction():
+    window = WindowedRake(max_documents=2)
+    docs = ["unique phrase{} here, and more{}.".format(n, n) for n in range(1500)]
+    for n, doc in enumerate(docs):
+        window.add(doc)
+        if n % 100 == 0:
+            # scores kept up to date across expiry and compaction
+            _same_scores(window.keyword_scores(top_k=2),
+                         CorpusRake().add_many(docs[max(0, n - 1):n + 1]).keyword_scores()[:2])
+    assert len(window._table.keywords) < 1100
+    _same_scores(window.keyword_scores(), CorpusRake().add_many(
+        ["unique phrase{} here, and more{}.".format(n, n) for n in (1498, 1499)]).keyword_scores())
+
+
+def test_window_adjoining():
+    docs = ["The axis of evil is here. ", "The axis of evil is there. ", "Linear constraints. "]
+    rake = Rake(adjoining=True)
+    window = WindowedRake(rake, max_documents=2)
+    window.add(docs[0], timestamp=1)
+    window.add(docs[1], timestamp=2)
+    assert 'axis of evil' in [kw.keyword for kw in window.keyword_scores()]
+    _same_scores(window.keyword_scores(), CorpusRake(rake).add_many(docs[:2]).keyword_scores())
+
+    # expiry takes the counts of the expired document with it
+    window.add(docs[2], timestamp=3)
+    assert 'axis of evil' not in [kw.keyword for kw in window.keyword_scores()]
+    _same_scores(window.keyword_scores(), CorpusRake(rake).add_many(docs[1:]).keyword_scores())
+
+
+def test_window_rejects_other_documents(texts):
+    window = WindowedRake(max_documents=2)
+    for doc in texts:
+        window.add(doc, timestamp=0)
+    expected = window.keyword_scores()
+    with pytest.raises(TypeError):
+        window.add(b'linear systems', timestamp=1)
+    assert window.n_documents == 2
+    assert window.keyword_scores() == expected